@@ -0,0 +1,86 @@
+import math
+
+
+# 流式直方图
+class Histogram:
+    """HDR风格的流式直方图：每个2的幂区间分成16个桶，相对误差约6%，每次记录 O(1)"""
+
+    SUB_BUCKETS = 16
+
+    def __init__(self):
+        self.counts = []  # 各桶的计数
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    @classmethod
+    def _index(cls, value):
+        """数值所在的桶号，小于 2*SUB_BUCKETS 的数值每个数一个桶"""
+        if value < 2 * cls.SUB_BUCKETS:
+            return value
+        shift = value.bit_length() - cls.SUB_BUCKETS.bit_length()
+        return shift * cls.SUB_BUCKETS + (value >> shift)
+
+    @classmethod
+    def _lower(cls, index):
+        """桶的下界"""
+        if index < 2 * cls.SUB_BUCKETS:
+            return index
+        shift = index // cls.SUB_BUCKETS - 1
+        return (index - shift * cls.SUB_BUCKETS) << shift
+
+    def record(self, value):
+        """记录一个非负数值（桶号计算内联，热路径上每次只做几次整数运算）"""
+        value = int(value) if value > 0 else 0
+        if value < 2 * self.SUB_BUCKETS:
+            index = value
+        else:
+            shift = value.bit_length() - self.SUB_BUCKETS.bit_length()
+            index = shift * self.SUB_BUCKETS + (value >> shift)
+        counts = self.counts
+        if index >= len(counts):
+            counts.extend([0] * (index + 1 - len(counts)))
+        counts[index] += 1
+        self.count += 1
+        self.total += value
+        if self.max is None:
+            self.min = self.max = value
+        elif value > self.max:
+            self.max = value
+        elif value < self.min:
+            self.min = value
+
+    def merge(self, other):
+        """合并另一个直方图"""
+        if len(other.counts) > len(self.counts):
+            self.counts.extend([0] * (len(other.counts) - len(self.counts)))
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.count += other.count
+        self.total += other.total
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, p):
+        """第 p 百分位数（近似值）"""
+        if not self.count:
+            return 0
+        target = max(math.ceil(p / 100 * self.count), 1)
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                lower = self._lower(index)
+                middle = lower + (self._lower(index + 1) - lower) // 2  # 取桶的中点作为估计值
+                return min(max(middle, self.min), self.max)
+        return self.max
+
+    def summary(self):
+        return {"count": self.count, "mean": self.mean(), "p50": self.percentile(50),
+                "p90": self.percentile(90), "p99": self.percentile(99), "max": self.max or 0}
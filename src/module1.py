@@ -1,6 +1,18 @@
+import argparse
+import array
+import collections
+import csv
+import heapq
+import itertools
+import multiprocessing
+import struct
+import sys
 import tkinter as tk
 from tkinter import ttk
 from tkinter import simpledialog
+from tkinter import filedialog
+
+from histogram import Histogram
 
 # 进程状态定义常量
 NEW = "新建"
@@ -9,93 +21,1119 @@ RUNNING = "运行"
 WAITING = "等待"
 TERMINATED = "终止"
 
+# 列式进程表中用小整数编码进程状态
+STATE_NAMES = [NEW, READY, RUNNING, WAITING, TERMINATED]
+STATE_CODES = {name: code for code, name in enumerate(STATE_NAMES)}
+
+# 就绪队列处于多级队列模式时的标记
+MLFQ = "mlfq"
+
+# 完全公平调度中优先级每低一级（数值加1），虚拟运行时间增长快 25%
+CFS_WEIGHT_BASE = 1.25
+# 与 nice 值一样，参与加权的优先级限制在 [-20, 19]，超出范围的按边界处理
+CFS_PRIORITY_MIN, CFS_PRIORITY_MAX = -20, 19
+CFS_WEIGHTS = [CFS_WEIGHT_BASE ** priority for priority in range(CFS_PRIORITY_MIN, CFS_PRIORITY_MAX + 1)]
+
 
 # 进程类，模拟进程控制块 (PCB)
 class Process:
     """进程控制块 (PCB)"""
 
-    def __init__(self, pid, priority, burst_time):
+    def __init__(self, pid, priority, burst_time, arrival_time=0, affinity=None):
         self.pid = pid  # 进程ID
         self.priority = priority  # 进程优先级
         self.burst_time = burst_time  # 进程所需CPU时间
         self.remaining_time = burst_time  # 剩余时间
+        self.arrival_time = arrival_time  # 到达时间
+        self.affinity = affinity  # 允许运行的CPU编号集合，None 表示不限制
         self.state = NEW  # 初始状态为"新建"
 
     def __repr__(self):
         return f"进程(pid={self.pid}, 优先级={self.priority}, 状态={self.state}, 剩余时间={self.remaining_time})"
 
 
+# 调度指标
+class SchedulingMetrics:
+    """调度指标：周转时间、等待时间、响应时间、吞吐量、上下文切换次数，每个事件 O(1) 增量更新"""
+
+    def __init__(self):
+        self.turnaround = Histogram()  # 周转时间 = 完成时间 - 到达时间
+        self.waiting = Histogram()  # 等待时间 = 周转时间 - 所需时间
+        self.response = Histogram()  # 响应时间 = 首次运行时间 - 到达时间
+        self.context_switches = 0  # 上下文切换次数
+        self.busy_time = 0  # CPU运行进程的总时间
+        self.completed = 0  # 完成的进程数
+
+    def merge(self, other):
+        """合并另一组指标（如多CPU的各个CPU）"""
+        self.turnaround.merge(other.turnaround)
+        self.waiting.merge(other.waiting)
+        self.response.merge(other.response)
+        self.context_switches += other.context_switches
+        self.busy_time += other.busy_time
+        self.completed += other.completed
+
+    def summary(self, elapsed, cpu_count=1):
+        """汇总为字典，elapsed 为模拟经过的总时间"""
+        return {"completed": self.completed,
+                "throughput": self.completed / elapsed if elapsed else 0.0,
+                "utilization": self.busy_time / (elapsed * cpu_count) if elapsed else 0.0,
+                "context_switches": self.context_switches,
+                "turnaround": self.turnaround.summary(),
+                "waiting": self.waiting.summary(),
+                "response": self.response.summary()}
+
+
 # 时钟类，用于模拟调度器
 class Clock:
-    """用于模拟时间的类"""
+    """用于模拟时间的类
 
-    def __init__(self):
-        self.ready_queue = []  # 就绪队列
+    就绪队列有三种存储方式：
+    列表模式 —— 用 deque 按队列顺序保存进程，供 fcfs/rr 在队首取出、队尾放回，均为 O(1)；
+    堆模式 —— 用二叉堆按 (排序键, 序号) 保存进程，供 priority/sjf/srtf/cfs 取最小者，每次 O(log n)；
+    多级队列模式 —— 每级一个 deque，供 mlfq 使用，取队首和老化提升都是 O(级数)。
+    序号记录进程在原就绪队列中的先后顺序，保证与稳定排序得到的调度结果完全一致。
+    cfs 的虚拟运行时间和 mlfq 的队列级别属于调度器状态，保存在时钟中而不是PCB上。
+    """
+
+    def __init__(self, keep_completed=True):
         self.completed = []  # 完成的进程列表
+        self.completed_count = 0  # 完成的进程数
+        self.keep_completed = keep_completed  # 回放大规模负载时可不保留已完成的进程
         self.time_slice = 2  # 默认时间片大小
+        self.time = 0  # 当前模拟时间
+        self._queue = self._new_queue()  # 列表模式下的就绪队列
+        self._heap = []  # 堆模式下的就绪队列，元素见 _heap_entry
+        self._pending = self._new_queue()  # 堆模式下新加入、尚未排序的进程，逻辑上位于队尾
+        self._levels = []  # 多级队列模式下各级的就绪队列，元素为 (入队时间, 进程)
+        self._level_count = 0  # 多级队列模式下的进程数
+        self._heap_key = None  # 当前堆使用的排序属性名，None 表示列表模式，MLFQ 表示多级队列模式
+        self._seq = 0  # 递增序号，用于相同键值时保持原有先后顺序
+        self._vruntime = self._new_state("d")  # 完全公平调度：进程 -> 虚拟运行时间
+        self._min_vruntime = 0  # 完全公平调度：就绪进程的最小虚拟运行时间，只增不减
+        self._level = self._new_state("h")  # 多级反馈队列：进程 -> 所在级别，0 级最高
+        self.mlfq_quanta = (1, 2, 4)  # 多级反馈队列各级的时间片
+        self.mlfq_aging = 50  # 在低级队列中等待超过该时间的进程提升一级，0 表示不老化
+        self.metrics = SchedulingMetrics()  # 调度指标
+        self._started = self._new_flags()  # 已经运行过的未完成进程，用于计算响应时间
+        self._last_run = None  # 上一次运行的进程，用于统计上下文切换
+
+    @property
+    def ready_queue(self):
+        """按当前调度顺序返回就绪队列的快照"""
+        if self._heap_key is None:
+            return list(self._queue)
+        if self._heap_key == MLFQ:
+            return [process for level in self._levels for _, process in level]
+        return [self._entry_process(entry) for entry in sorted(self._heap)] + list(self._pending)
 
     def set_time_slice(self, time_slice):
         """设置时间片大小"""
+        if time_slice <= 0:
+            raise ValueError("时间片必须大于0")
         self.time_slice = time_slice
 
+    def set_mlfq(self, quanta, aging):
+        """设置多级反馈队列的各级时间片和老化时间"""
+        if not quanta or min(quanta) <= 0:
+            raise ValueError("各级时间片必须大于0")
+        if self._heap_key == MLFQ:
+            self._use_list()  # 级别数可能变化，下次调度时重建
+        self.mlfq_quanta = tuple(quanta)
+        self.mlfq_aging = aging
+        self._level.clear()
+
     def add_process(self, process):
         """将进程添加到就绪队列"""
-        process.state = READY
-        self.ready_queue.append(process)
+        self._set_field(process, "state", READY)
+        if self._heap_key is None:
+            self._queue.append(process)
+        elif self._heap_key == MLFQ:
+            self._enqueue_level(process, self._level.setdefault(process, 0))
+        else:
+            self._pending.append(process)  # 等下一次按同一键调度时再入堆
+
+    # 以下方法创建就绪队列和调度器状态的容器、组成堆元素，TableClock 换成按行号存储的紧凑数组
+    def _new_queue(self, processes=()):
+        """列表模式的就绪队列和堆模式的待入堆队列"""
+        return collections.deque(processes)
+
+    def _new_level_queue(self):
+        """多级队列模式下一级的队列，元素为 (入队时间, 进程)"""
+        return collections.deque()
+
+    def _new_state(self, typecode):
+        """进程 -> 调度器状态的映射，typecode 是 TableClock 存储该状态所用的数组类型"""
+        return {}
+
+    def _new_flags(self):
+        """进程的集合"""
+        return set()
+
+    def _heap_entry(self, key, seq, process):
+        """堆元素，按 (排序键, 序号) 比较大小"""
+        return [key, seq, process]
+
+    def _entry_key(self, entry):
+        return entry[0]
+
+    def _entry_process(self, entry):
+        return entry[2]
+
+    def _rekey(self, entry, key):
+        """把堆元素的排序键换成 key，返回新的堆元素"""
+        entry[0] = key
+        return entry
+
+    def _ready_count(self):
+        """就绪队列中的进程数"""
+        if self._heap_key is None:
+            return len(self._queue)
+        if self._heap_key == MLFQ:
+            return self._level_count
+        return len(self._heap) + len(self._pending)
+
+    def _use_list(self):
+        """切换到列表模式，保持当前调度顺序不变"""
+        if self._heap_key is not None:
+            self._queue = self._new_queue(self.ready_queue)
+            self._heap = []
+            self._pending = self._new_queue()
+            self._levels = []
+            self._level_count = 0
+            self._heap_key = None
+
+    def _use_heap(self, key):
+        """切换到按属性 key 排序的堆模式，等价于对就绪队列做一次稳定排序"""
+        if self._heap_key == key:
+            # 同一排序键：只需把新加入的进程入堆，序号更大即排在同键值进程之后
+            for process in self._pending:
+                self._seq += 1
+                heapq.heappush(self._heap, self._heap_entry(self._sort_key(process, key), self._seq, process))
+            self._pending = self._new_queue()
+            return
+        order = self.ready_queue
+        self._queue = self._new_queue()
+        self._pending = self._new_queue()
+        self._levels = []
+        self._level_count = 0
+        self._heap_key = key  # 先切换排序键，堆元素按新的键组成
+        heap = []
+        for process in order:
+            self._seq += 1
+            heap.append(self._heap_entry(self._sort_key(process, key), self._seq, process))
+        heapq.heapify(heap)
+        self._heap = heap
+
+    def _use_levels(self):
+        """切换到多级队列模式，各进程按原有顺序进入自己所在级别的队尾"""
+        if self._heap_key == MLFQ:
+            return
+        order = self.ready_queue
+        self._queue = self._new_queue()
+        self._heap = []
+        self._pending = self._new_queue()
+        self._levels = [self._new_level_queue() for _ in self.mlfq_quanta]
+        self._level_count = 0
+        self._heap_key = MLFQ
+        for process in order:
+            self._enqueue_level(process, self._level.setdefault(process, 0))
+
+    def _enqueue_level(self, process, level):
+        """把进程放到某一级队列的队尾"""
+        self._level[process] = level
+        self._levels[level].append((self.time, process))
+        self._level_count += 1
+
+    def _top_level(self):
+        """最高的非空级别"""
+        for level, queue in enumerate(self._levels):
+            if queue:
+                return level
+        raise IndexError("就绪队列为空")
+
+    def _sort_key(self, process, key):
+        """进程在堆模式下的排序键，新进入调度器的进程从最小虚拟运行时间开始"""
+        if key == "vruntime":
+            return self._vruntime.setdefault(process, self._min_vruntime)
+        return self._field(process, key)
+
+    def _requeue_head(self, key_value):
+        """以新的键值把堆顶进程放回堆中，排在同键值进程之后"""
+        self._seq += 1
+        heapq.heapreplace(self._heap, self._heap_entry(key_value, self._seq, self._entry_process(self._heap[0])))
+
+    def _head(self):
+        """返回就绪队列队首的进程"""
+        if self._heap_key == MLFQ:
+            return self._levels[self._top_level()][0][1]
+        if self._heap_key is not None and not self._heap:
+            self._use_list()  # 堆已取空，剩下的都是按到达顺序排列的新进程
+        if self._heap_key is None:
+            return self._queue[0]
+        return self._entry_process(self._heap[0])
+
+    def _run_head(self, run_time):
+        """让就绪队列队首进程运行 run_time 个时间单位，返回 (进程, 是否完成)"""
+        process = self._head()
+        self._on_run(process, run_time)
+        remaining_time = self._field(process, "remaining_time") - run_time  # 执行时间减少
+        self.time += run_time
+        if remaining_time <= 0:
+            self._set_field(process, "remaining_time", 0)
+            self._set_field(process, "state", TERMINATED)  # 执行完毕，进程终止
+            if self._heap_key is None:
+                self._queue.popleft()  # 从就绪队列移除
+            elif self._heap_key == MLFQ:
+                self._levels[self._level[process]].popleft()
+                self._level_count -= 1
+            else:
+                heapq.heappop(self._heap)
+            self._finish(process)
+            return process, True
+        self._set_field(process, "remaining_time", remaining_time)
+        self._set_field(process, "state", RUNNING)  # 设置进程为运行状态
+        if self._heap_key == "remaining_time":
+            self._heap[0] = self._rekey(self._heap[0], remaining_time)  # 堆顶键值只会减小，堆性质保持不变
+        return process, False
+
+    # 以下三个方法封装对PCB字段的访问，TableClock 改为读写列式进程表
+    def _field(self, process, name):
+        """读取进程的字段"""
+        return getattr(process, name)
+
+    def _set_field(self, process, name, value):
+        """设置进程的字段"""
+        setattr(process, name, value)
+
+    def _describe(self, process):
+        """进程的日志描述"""
+        return repr(process)
+
+    def _on_run(self, process, run_time):
+        """在进程开始运行前记录上下文切换、响应时间和CPU忙碌时间"""
+        metrics = self.metrics
+        if process != self._last_run:
+            if self._last_run is not None:
+                metrics.context_switches += 1
+            self._last_run = process
+        if process not in self._started:
+            self._started.add(process)
+            metrics.response.record(self.time - self._field(process, "arrival_time"))
+        metrics.busy_time += run_time
+
+    def _finish(self, process):
+        """记录已完成的进程"""
+        self.completed_count += 1
+        turnaround = self.time - self._field(process, "arrival_time")
+        metrics = self.metrics
+        metrics.completed += 1
+        metrics.turnaround.record(turnaround)
+        metrics.waiting.record(turnaround - self._field(process, "burst_time"))
+        self._started.discard(process)
+        self._vruntime.pop(process, None)
+        self._level.pop(process, None)
+        if self.keep_completed:
+            self.completed.append(process)
 
     def fcfs(self):
         """先来先服务调度算法"""
-        if not self.ready_queue:
+        if not self._ready_count():
             return "无可运行进程"
-        process = self.ready_queue[0]
-        process.state = RUNNING  # 设置进程为运行状态
-        process.remaining_time -= 1  # 执行时间减少1
-        if process.remaining_time <= 0:
-            process.remaining_time = 0
-            process.state = TERMINATED  # 执行完毕，进程终止
-            self.completed.append(self.ready_queue.pop(0))  # 从就绪队列移除
-            return f"完成: {process}"
-        process.state = RUNNING  # 如果未完成，恢复为就绪状态
-        return f"运行中: {process}"
+        process, finished = self._run_head(1)
+        if finished:
+            return f"完成: {self._describe(process)}"
+        return f"运行中: {self._describe(process)}"
 
     def rr(self):
         """轮转调度算法"""
-        if not self.ready_queue:
+        if not self._ready_count():
             return "无可运行进程"
-        process = self.ready_queue.pop(0)  # 取出第一个进程
-        process.state = RUNNING
-        run_time = min(process.remaining_time, self.time_slice)  # 运行时间为时间片或剩余时间，取最小
-        process.remaining_time -= run_time
-        if process.remaining_time > 0:
-            process.state = RUNNING
-            self.ready_queue.append(process)  # 如果没完成，放回就绪队列
+        self._use_list()
+        process = self._queue.popleft()  # 取出第一个进程
+        self._set_field(process, "state", RUNNING)
+        remaining_time = self._field(process, "remaining_time")
+        run_time = min(remaining_time, self.time_slice)  # 运行时间为时间片或剩余时间，取最小
+        remaining_time -= run_time
+        self._set_field(process, "remaining_time", remaining_time)
+        self._on_run(process, run_time)
+        self.time += run_time
+        if remaining_time > 0:
+            self._queue.append(process)  # 如果没完成，放回就绪队列
         else:
-            process.state = TERMINATED
-            self.completed.append(process)  # 完成，加入已完成列表
-            return f"完成: {process}"
-        return f"运行中: {process}"
+            self._set_field(process, "state", TERMINATED)
+            self._finish(process)  # 完成，加入已完成列表
+            return f"完成: {self._describe(process)}"
+        return f"运行中: {self._describe(process)}"
 
     def priority_scheduling(self):
         """优先级调度算法"""
-        if not self.ready_queue:
+        if not self._ready_count():
             return "无可运行进程"
-        self.ready_queue.sort(key=lambda p: p.priority)  # 按优先级排序
+        self._use_heap("priority")  # 按优先级组织就绪队列
         return self.fcfs()  # 使用FCFS算法执行调度
 
     def sjf(self):
         """最短作业优先调度算法"""
-        if not self.ready_queue:
+        if not self._ready_count():
             return "无可运行进程"
-        self.ready_queue.sort(key=lambda p: p.burst_time)  # 按作业时间（burst_time）排序
+        self._use_heap("burst_time")  # 按作业时间（burst_time）组织就绪队列
         return self.fcfs()  # 使用FCFS算法执行调度
 
     def srtf(self):
         """最短剩余时间优先调度算法"""
-        if not self.ready_queue:
+        if not self._ready_count():
             return "无可运行进程"
-        self.ready_queue.sort(key=lambda p: p.remaining_time)  # 按剩余时间排序
+        self._use_heap("remaining_time")  # 按剩余时间组织就绪队列
         return self.fcfs()  # 使用FCFS算法执行调度
 
+    def cfs(self):
+        """完全公平调度算法：虚拟运行时间最小的进程运行一个时间片，优先级数值越小虚拟时间增长越慢"""
+        if not self._ready_count():
+            return "无可运行进程"
+        self._use_heap("vruntime")  # 按虚拟运行时间组织就绪队列
+        process = self._head()
+        run_time = min(self._field(process, "remaining_time"), self.time_slice)
+        process, finished = self._run_head(run_time)
+        if not finished:
+            priority = min(max(self._field(process, "priority"), CFS_PRIORITY_MIN), CFS_PRIORITY_MAX)
+            vruntime = self._vruntime[process] + run_time * CFS_WEIGHTS[priority - CFS_PRIORITY_MIN]
+            self._vruntime[process] = vruntime
+            self._requeue_head(vruntime)
+        if self._heap:
+            self._min_vruntime = max(self._min_vruntime, self._entry_key(self._heap[0]))
+        if finished:
+            return f"完成: {self._describe(process)}"
+        return f"运行中: {self._describe(process)}"
+
+    def mlfq(self):
+        """多级反馈队列调度算法：运行最高级队列的队首进程一个该级时间片，用完时间片则降一级"""
+        if not self._ready_count():
+            return "无可运行进程"
+        self._use_levels()
+        if self.mlfq_aging:
+            # 防止饥饿：各级队首等待最久，等待超过老化时间就提升一级
+            for level in range(1, len(self._levels)):
+                queue = self._levels[level]
+                while queue and self.time - queue[0][0] >= self.mlfq_aging:
+                    _, process = queue.popleft()
+                    self._level_count -= 1
+                    self._enqueue_level(process, level - 1)
+        process = self._head()
+        level = self._level[process]
+        run_time = min(self._field(process, "remaining_time"), self.mlfq_quanta[level])
+        process, finished = self._run_head(run_time)
+        if finished:
+            return f"完成: {self._describe(process)}"
+        self._levels[level].popleft()
+        self._level_count -= 1
+        self._enqueue_level(process, min(level + 1, len(self._levels) - 1))
+        return f"运行中: {self._describe(process)}"
+
+    def summary(self):
+        """调度指标汇总"""
+        return self.metrics.summary(self.time)
+
+    def schedule(self, algorithm):
+        """按算法名称执行一步调度"""
+        if algorithm == "fcfs":
+            return self.fcfs()  # 执行FCFS调度
+        elif algorithm == "rr":
+            return self.rr()  # 执行轮转调度
+        elif algorithm == "priority":
+            return self.priority_scheduling()  # 执行优先级调度
+        elif algorithm == "sjf":
+            return self.sjf()  # 执行最短作业优先调度
+        elif algorithm == "srtf":
+            return self.srtf()  # 执行最短剩余时间优先调度
+        elif algorithm == "cfs":
+            return self.cfs()  # 执行完全公平调度
+        elif algorithm == "mlfq":
+            return self.mlfq()  # 执行多级反馈队列调度
+        return "未知调度算法"
+
+    def _steal(self, allowed):
+        """从就绪队列末尾取走一个进程供其他CPU运行，队首进程不会被取走
+
+        allowed(进程) 为 False 时不迁移，返回 None。
+        """
+        if self._ready_count() < 2:
+            return None
+        if self._heap_key is None:
+            process = self._queue.pop() if allowed(self._queue[-1]) else None
+        elif self._heap_key == MLFQ:
+            # 取走最低非空级别的队尾进程，它不可能是队首
+            queue = next(queue for queue in reversed(self._levels) if queue)
+            process = queue.pop()[1] if allowed(queue[-1][1]) else None
+            if process is not None:
+                self._level_count -= 1
+        elif self._pending:
+            process = self._pending.pop() if allowed(self._pending[-1]) else None
+        else:
+            # 取走堆的最后一个叶子，堆性质保持不变
+            process = self._entry_process(self._heap[-1])
+            if allowed(process):
+                self._heap.pop()
+            else:
+                process = None
+        if process is not None:
+            self._vruntime.pop(process, None)  # 调度器状态由新的CPU重新建立
+            self._level.pop(process, None)
+        return process
+
+
+# 列式进程表
+class ProcessTable:
+    """列式进程表，每个PCB字段单独存成一列紧凑数组，进程用行号表示
+
+    每个进程只占 5 个32位整数加 1 个字节的状态码（21字节），约为 Process 对象的十分之一；
+    进入就绪队列后的额外开销见 TableClock。
+    """
+
+    FIELDS = ("pid", "priority", "burst_time", "remaining_time", "arrival_time")
+
+    def __init__(self):
+        for name in self.FIELDS:
+            setattr(self, name, array.array("i"))
+        self.state = bytearray()  # 状态码，见 STATE_CODES
+
+    def __len__(self):
+        return len(self.pid)
+
+    def add(self, pid, priority, burst_time, arrival_time=0):
+        """添加一个新建状态的进程，返回其行号"""
+        row = len(self.pid)
+        self.pid.append(pid)
+        self.priority.append(priority)
+        self.burst_time.append(burst_time)
+        self.remaining_time.append(burst_time)
+        self.arrival_time.append(arrival_time)
+        self.state.append(STATE_CODES[NEW])
+        return row
+
+    def stream(self, records):
+        """把 (pid, 到达时间, 优先级, 所需时间) 记录逐条加入进程表并生成行号"""
+        for pid, arrival, priority, burst in records:
+            yield self.add(pid, priority, burst, arrival)
+
+    def get(self, row, name):
+        """读取某行的字段，状态返回状态名"""
+        if name == "state":
+            return STATE_NAMES[self.state[row]]
+        return getattr(self, name)[row]
+
+    def set(self, row, name, value):
+        """设置某行的字段，状态以状态名给出"""
+        if name == "state":
+            self.state[row] = STATE_CODES[value]
+        else:
+            getattr(self, name)[row] = value
+
+    def describe(self, row):
+        """与 Process.__repr__ 格式相同的描述，只在需要输出时才生成"""
+        return (f"进程(pid={self.pid[row]}, 优先级={self.priority[row]}, "
+                f"状态={STATE_NAMES[self.state[row]]}, 剩余时间={self.remaining_time[row]})")
+
+
+class RowQueue:
+    """只存行号的 FIFO 队列，行号保存在 array('i') 中，每个4字节；
+    支持 Clock 对就绪队列用到的 deque 操作（队首取出、两端放入取出、查看两端）"""
+
+    __slots__ = ("rows", "head")
+
+    def __init__(self, rows=(), typecode="i"):
+        self.rows = array.array(typecode, rows)
+        self.head = 0  # 队首在 rows 中的下标，之前的元素都已出队
+
+    def __len__(self):
+        return len(self.rows) - self.head
+
+    def __iter__(self):
+        return itertools.islice(self.rows, self.head, None)
+
+    def __getitem__(self, index):
+        index += len(self.rows) if index < 0 else self.head  # 正下标越界时由数组抛出 IndexError
+        if index < self.head:
+            raise IndexError("队列下标越界")
+        return self.rows[index]
+
+    def append(self, row):
+        self.rows.append(row)
+
+    def pop(self):
+        if len(self.rows) <= self.head:
+            raise IndexError("队列为空")
+        return self.rows.pop()
+
+    def popleft(self):
+        head = self.head
+        if head >= len(self.rows):
+            raise IndexError("队列为空")
+        row = self.rows[head]
+        self.head = head = head + 1
+        if head >= 4096 and 2 * head >= len(self.rows):
+            del self.rows[:head]  # 已出队的部分过半时整体前移，均摊 O(1)
+            self.head = 0
+        return row
+
+
+class TimedRowQueue:
+    """多级队列模式下的一级队列：入队时间和行号分存两个数组，每个元素共12字节；
+    元素以 (入队时间, 行号) 元组的形式读写，支持 Clock 对多级队列用到的 deque 操作"""
+
+    __slots__ = ("times", "rows", "head")
+
+    def __init__(self):
+        self.times = array.array("q")
+        self.rows = array.array("i")
+        self.head = 0  # 队首在两个数组中的下标
+
+    def __len__(self):
+        return len(self.rows) - self.head
+
+    def __iter__(self):
+        return zip(itertools.islice(self.times, self.head, None), itertools.islice(self.rows, self.head, None))
+
+    def __getitem__(self, index):
+        index += len(self.rows) if index < 0 else self.head
+        if index < self.head:
+            raise IndexError("队列下标越界")
+        return self.times[index], self.rows[index]
+
+    def append(self, entry):
+        self.times.append(entry[0])
+        self.rows.append(entry[1])
+
+    def pop(self):
+        if len(self.rows) <= self.head:
+            raise IndexError("队列为空")
+        return self.times.pop(), self.rows.pop()
+
+    def popleft(self):
+        head = self.head
+        if head >= len(self.rows):
+            raise IndexError("队列为空")
+        entry = self.times[head], self.rows[head]
+        self.head = head = head + 1
+        if head >= 4096 and 2 * head >= len(self.rows):
+            del self.times[:head]  # 与 RowQueue 相同，已出队的部分过半时整体前移
+            del self.rows[:head]
+            self.head = 0
+        return entry
+
+
+class RowState:
+    """按行号索引的调度器状态列（虚拟运行时间、队列级别），支持 Clock 对状态字典用到的操作；
+    数组中的 -1 表示没有记录，这两种状态都不会取负值"""
+
+    __slots__ = ("values",)
+
+    MISSING = -1
+
+    def __init__(self, typecode):
+        self.values = array.array(typecode)
+
+    def _reserve(self, row):
+        """把列加长到能存放 row 行"""
+        self.values.extend(itertools.repeat(self.MISSING, row + 1 - len(self.values)))
+
+    def __getitem__(self, row):
+        value = self.values[row] if row < len(self.values) else self.MISSING
+        if value == self.MISSING:
+            raise KeyError(row)
+        return value
+
+    def __setitem__(self, row, value):
+        if row >= len(self.values):
+            self._reserve(row)
+        self.values[row] = value
+
+    def setdefault(self, row, default):
+        if row >= len(self.values):
+            self._reserve(row)
+        value = self.values[row]
+        if value == self.MISSING:
+            self.values[row] = value = default
+        return value
+
+    def pop(self, row, default=None):
+        if row >= len(self.values) or self.values[row] == self.MISSING:
+            return default
+        value = self.values[row]
+        self.values[row] = self.MISSING
+        return value
+
+    def clear(self):
+        self.values = array.array(self.values.typecode)
+
+
+class RowFlags:
+    """按行号索引的标记列，每行1字节，支持 Clock 对进程集合用到的 add/discard/in"""
+
+    __slots__ = ("flags",)
+
+    def __init__(self):
+        self.flags = bytearray()
+
+    def __contains__(self, row):
+        return row < len(self.flags) and self.flags[row] == 1
+
+    def add(self, row):
+        if row >= len(self.flags):
+            self.flags.extend(bytes(row + 1 - len(self.flags)))
+        self.flags[row] = 1
+
+    def discard(self, row):
+        if row < len(self.flags):
+            self.flags[row] = 0
+
+
+class TableClock(Clock):
+    """在列式进程表上运行全部调度算法的时钟，就绪队列中保存的是进程表的行号
+
+    就绪队列和调度器状态都按行号存储：列表模式的队列是 RowQueue，多级队列是 TimedRowQueue，
+    虚拟运行时间、队列级别和是否已响应是按行号索引的数组列。堆元素是一个整数，从高位到低位依次为
+    排序键、序号和行号，比较大小与 [排序键, 序号, 进程] 列表相同（虚拟运行时间按 IEEE 754 位模式编码，
+    非负浮点数的位模式与数值同序）。
+
+    十万个就绪进程时每个进程的实测内存（含进程表）：fcfs/rr 约 27 字节、mlfq 约 38 字节，
+    为 Process 对象加 deque 的十分之一；sjf/srtf/priority 约 70 字节、cfs 约 88 字节，
+    其中堆元素整数约占 44 字节，是 Process 对象的四到五分之一。
+    """
+
+    SEQ_BITS = 64
+    ROW_BITS = 32
+    KEY_SHIFT = SEQ_BITS + ROW_BITS
+    ROW_MASK = (1 << ROW_BITS) - 1
+    SEQ_MASK = ((1 << SEQ_BITS) - 1) << ROW_BITS
+    DOUBLE = struct.Struct("<d")
+    INT64 = struct.Struct("<q")
+
+    def __init__(self, table=None, keep_completed=True):
+        super().__init__(keep_completed)
+        self.table = table if table is not None else ProcessTable()
+
+    def _field(self, row, name):
+        return self.table.get(row, name)
+
+    def _set_field(self, row, name, value):
+        self.table.set(row, name, value)
+
+    def _describe(self, row):
+        return self.table.describe(row)
+
+    def _new_queue(self, rows=()):
+        return RowQueue(rows)
+
+    def _new_level_queue(self):
+        return TimedRowQueue()
+
+    def _new_state(self, typecode):
+        return RowState(typecode)
+
+    def _new_flags(self):
+        return RowFlags()
+
+    def _heap_entry(self, key, seq, row):
+        if self._heap_key == "vruntime":
+            key = self.INT64.unpack(self.DOUBLE.pack(key))[0]
+        return (key << self.KEY_SHIFT) | (seq << self.ROW_BITS) | row
+
+    def _entry_key(self, entry):
+        key = entry >> self.KEY_SHIFT
+        if self._heap_key == "vruntime":
+            return self.DOUBLE.unpack(self.INT64.pack(key))[0]
+        return key
+
+    def _entry_process(self, entry):
+        return entry & self.ROW_MASK
+
+    def _rekey(self, entry, key):
+        if self._heap_key == "vruntime":
+            key = self.INT64.unpack(self.DOUBLE.pack(key))[0]
+        return (key << self.KEY_SHIFT) | (entry & (self.SEQ_MASK | self.ROW_MASK))
+
+
+# 多CPU调度模拟
+class SMPClock:
+    """多CPU（SMP）调度模拟
+
+    每个CPU有自己的 Clock 和就绪队列，各自的时间独立推进，每次总是推进时间最早的CPU，
+    因此五种调度算法都可以原样在每个CPU上运行。新进程分配给允许运行它的、就绪进程最少的CPU；
+    CPU空闲时从就绪进程最多的CPU队尾窃取一个进程，并记录迁移次数。
+    """
+
+    def __init__(self, cpu_count=2, keep_completed=True):
+        if cpu_count <= 0:
+            raise ValueError("CPU数必须大于0")
+        self.cpus = [Clock(keep_completed) for _ in range(cpu_count)]
+        self.busy_time = [0] * cpu_count  # 各CPU运行进程的总时间
+        self.migrations = [0] * cpu_count  # 各CPU窃取到的进程数
+
+    @property
+    def time(self):
+        """全部CPU中最晚的时间"""
+        return max(cpu.time for cpu in self.cpus)
+
+    @property
+    def completed_count(self):
+        return sum(cpu.completed_count for cpu in self.cpus)
+
+    def set_time_slice(self, time_slice):
+        """设置所有CPU的时间片大小"""
+        for cpu in self.cpus:
+            cpu.set_time_slice(time_slice)
+
+    @staticmethod
+    def _allowed(process, cpu_id):
+        """进程是否允许在该CPU上运行"""
+        return process.affinity is None or cpu_id in process.affinity
+
+    def add_process(self, process):
+        """把进程分配给允许运行它的、就绪进程最少的CPU"""
+        candidates = [i for i in range(len(self.cpus)) if self._allowed(process, i)]
+        if not candidates:
+            raise ValueError(f"进程 {process.pid} 的CPU亲和性不包含任何CPU")
+        cpu_id = min(candidates, key=lambda i: (self.cpus[i]._ready_count(), i))
+        self.cpus[cpu_id].add_process(process)
+
+    def _steal(self, thief):
+        """为空闲的CPU从就绪进程最多的CPU窃取一个进程"""
+        victims = sorted(range(len(self.cpus)), key=lambda i: -self.cpus[i]._ready_count())
+        for victim in victims:
+            if victim == thief or self.cpus[victim]._ready_count() < 2:
+                continue
+            process = self.cpus[victim]._steal(lambda p: self._allowed(p, thief))
+            if process is not None:
+                if process in self.cpus[victim]._started:  # 已响应过的进程迁移后不再重复计算响应时间
+                    self.cpus[victim]._started.discard(process)
+                    self.cpus[thief]._started.add(process)
+                self.cpus[thief].add_process(process)
+                self.migrations[thief] += 1
+                return True
+        return False
+
+    def step(self, algorithm):
+        """推进时间最早的CPU一步，返回日志信息；所有CPU都无事可做时返回 None"""
+        order = sorted(range(len(self.cpus)), key=lambda i: (self.cpus[i].time, self.cpus[i]._ready_count() == 0))
+        for cpu_id in order:
+            cpu = self.cpus[cpu_id]
+            if cpu._ready_count() or self._steal(cpu_id):
+                start = cpu.time
+                result = cpu.schedule(algorithm)
+                self.busy_time[cpu_id] += cpu.time - start
+                return f"CPU{cpu_id}: {result}"
+            # 该CPU空闲且无进程可窃取，空转到下一个有进程的CPU的时间
+            busy = [other.time for other in self.cpus if other._ready_count() and other.time > cpu.time]
+            if busy:
+                cpu.time = min(busy)
+                return f"CPU{cpu_id}: 空闲"
+        return None
+
+    def run(self, algorithm, arrivals=()):
+        """按到达时间送入进程并运行到全部完成"""
+        arrivals = iter(arrivals)
+        pending = next(arrivals, None)
+        while True:
+            now = min(cpu.time for cpu in self.cpus)
+            while pending is not None and pending.arrival_time <= now:
+                self.add_process(pending)
+                pending = next(arrivals, None)
+            if self.step(algorithm) is None:
+                if pending is None:
+                    return
+                for cpu in self.cpus:  # 全部CPU空闲，一起跳到下一个进程到达的时刻
+                    cpu.time = max(cpu.time, pending.arrival_time)
+
+    def summary(self):
+        """全部CPU合并后的调度指标汇总"""
+        metrics = SchedulingMetrics()
+        for cpu in self.cpus:
+            metrics.merge(cpu.metrics)
+        return metrics.summary(self.time, len(self.cpus))
+
+    def report(self):
+        """各CPU的运行时间、利用率、完成进程数和迁移次数"""
+        elapsed = self.time
+        return [{"cpu": i,
+                 "busy_time": self.busy_time[i],
+                 "utilization": self.busy_time[i] / elapsed if elapsed else 0.0,
+                 "completed": cpu.completed_count,
+                 "migrations": self.migrations[i]}
+                for i, cpu in enumerate(self.cpus)]
+
+
+# 离散事件模拟引擎
+class Simulator:
+    """离散事件模拟引擎
+
+    不再逐个时间单位调用 Clock，而是直接跳到下一个事件：进程到达、时间片用完或进程完成。
+    两次事件之间队首进程不会改变，因此一次性运行到下一个事件与逐步推进的调度结果完全相同，
+    总开销只与事件数有关，与模拟的时间长度无关。
+    """
+
+    # 各调度算法在堆模式下使用的排序属性，fcfs 和 rr 不需要排序
+    SORT_KEYS = {"fcfs": None, "rr": None, "priority": "priority", "sjf": "burst_time", "srtf": "remaining_time",
+                 "cfs": None, "mlfq": None}
+    # 每次调度运行一个时间片的算法，一个时间片就是一个事件
+    SLICED = ("rr", "cfs", "mlfq")
+
+    def __init__(self, clock=None, algorithm="fcfs", arrivals=()):
+        if algorithm not in self.SORT_KEYS:
+            raise ValueError(f"未知调度算法: {algorithm}")
+        self.clock = clock if clock is not None else Clock()
+        self.algorithm = algorithm
+        self.events = 0  # 已处理的事件数
+        self._arrivals = iter(arrivals)  # 按到达时间排好序的进程序列，逐个读取
+        self._next = None  # 下一个尚未到达的进程
+        self._next_time = None  # 下一个进程的到达时间
+        self._fetch()
+
+    def _fetch(self):
+        """读取下一个待到达的进程"""
+        previous_time = self._next_time
+        self._next = next(self._arrivals, None)
+        self._next_time = None if self._next is None else self.clock._field(self._next, "arrival_time")
+        if previous_time is not None and self._next_time is not None and self._next_time < previous_time:
+            raise ValueError("进程序列必须按到达时间排序")
+
+    def _admit(self):
+        """把到达时间不晚于当前时间的进程加入就绪队列"""
+        while self._next is not None and self._next_time <= self.clock.time:
+            self.clock.add_process(self._next)
+            self._fetch()
+
+    def _dispatch(self, limit):
+        """处理一个调度事件，非轮转算法最多运行到 limit 时刻"""
+        clock = self.clock
+        if self.algorithm in self.SLICED:
+            clock.schedule(self.algorithm)  # 一个时间片就是一个事件
+            return
+        key = self.SORT_KEYS[self.algorithm]
+        if key is not None:
+            clock._use_heap(key)
+        run_time = clock._field(clock._head(), "remaining_time")
+        if self._next is not None:
+            run_time = min(run_time, self._next_time - clock.time)
+        if limit is not None:
+            run_time = min(run_time, limit - clock.time)
+        clock._run_head(max(run_time, 1))
+
+    def _advance(self, limit=None):
+        """推进一个事件，没有事件可处理时返回 False"""
+        self._admit()
+        clock = self.clock
+        if limit is not None and clock.time >= limit:
+            return False
+        if not clock._ready_count():
+            if self._next is None:
+                return False
+            # CPU空闲，直接跳到下一个进程到达的时刻
+            if limit is not None and self._next_time > limit:
+                clock.time = limit
+                return False
+            clock.time = self._next_time
+        else:
+            self._dispatch(limit)
+        self.events += 1
+        return True
+
+    def run_until(self, t):
+        """模拟到 t 时刻为止（轮转算法的最后一个时间片可能越过 t）"""
+        while self._advance(t):
+            pass
+
+    def run_to_completion(self):
+        """模拟到所有进程都完成为止"""
+        while self._advance():
+            pass
+
+
+# 二进制工作负载文件：文件头后为定长记录 (pid, 到达时间, 优先级, 所需时间)，均为小端32位整数
+WORKLOAD_MAGIC = b"PCBW"
+WORKLOAD_RECORD = struct.Struct("<4i")
+
+
+def read_workload_records(file_path, chunk_records=65536):
+    """逐条读取工作负载文件，生成 (pid, 到达时间, 优先级, 所需时间) 记录，整个文件不会一次性读入内存
+
+    .bin 文件为二进制格式，其余按 CSV 处理：每行 "pid,到达时间,优先级,所需时间"，
+    允许空行、以 # 开头的注释行和一行表头。记录需按到达时间排序。
+    """
+    if file_path.endswith(".bin"):
+        with open(file_path, "rb") as file:
+            if file.read(len(WORKLOAD_MAGIC)) != WORKLOAD_MAGIC:
+                raise ValueError("不是有效的二进制工作负载文件")
+            while True:
+                chunk = file.read(WORKLOAD_RECORD.size * chunk_records)
+                if not chunk:
+                    break
+                if len(chunk) % WORKLOAD_RECORD.size:
+                    raise ValueError("二进制工作负载文件不完整")
+                yield from WORKLOAD_RECORD.iter_unpack(chunk)
+        return
+
+    with open(file_path, "r") as file:
+        first = True  # 表头只能出现在第一个非空、非注释行
+        for line_number, line in enumerate(file, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                pid, arrival, priority, burst = map(int, line.split(","))
+            except ValueError:
+                if first:
+                    first = False
+                    continue  # 跳过表头
+                raise ValueError(f"第{line_number}行格式错误: {line}")
+            first = False
+            yield pid, arrival, priority, burst
+
+
+def read_workload(file_path):
+    """逐条读取工作负载文件并生成 Process"""
+    for pid, arrival, priority, burst in read_workload_records(file_path):
+        yield Process(pid, priority, burst, arrival)
+
+
+def write_workload(file_path, records):
+    """把 (pid, 到达时间, 优先级, 所需时间) 记录流写成二进制工作负载文件"""
+    with open(file_path, "wb") as file:
+        file.write(WORKLOAD_MAGIC)
+        for record in records:
+            file.write(WORKLOAD_RECORD.pack(*record))
+
+
+def replay_workload(file_path, algorithm, time_slice=2, columnar=False):
+    """按到达时间把工作负载文件中的进程送入调度器，运行到全部完成，返回模拟引擎
+
+    columnar 为 True 时使用列式进程表保存PCB，适合百万级进程的负载。
+    """
+    if columnar:
+        clock = TableClock(keep_completed=False)
+        arrivals = clock.table.stream(read_workload_records(file_path))
+    else:
+        clock = Clock(keep_completed=False)
+        arrivals = read_workload(file_path)
+    clock.set_time_slice(time_slice)
+    simulator = Simulator(clock, algorithm, arrivals)
+    simulator.run_to_completion()
+    return simulator
+
+
+def compare_algorithms(file_path, algorithms, time_slice=2):
+    """用同一工作负载依次回放多个调度算法，返回 {算法: 调度指标汇总}"""
+    return {algorithm: replay_workload(file_path, algorithm, time_slice).clock.summary() for algorithm in algorithms}
+
+
+# 参数扫描结果表的列
+SWEEP_COLUMNS = ["algorithm", "time_slice", "cpu_count", "time", "completed", "throughput", "utilization",
+                 "context_switches", "migrations", "turnaround_mean", "turnaround_p99", "waiting_mean",
+                 "waiting_p99", "response_mean", "response_p99"]
+
+
+def _run_sweep_config(config):
+    """在工作进程中运行一组参数，每组都从文件重新读取负载，互不影响"""
+    file_path, algorithm, time_slice, cpu_count = config
+    if cpu_count == 1:
+        clock = replay_workload(file_path, algorithm, time_slice).clock
+        summary, migrations = clock.summary(), 0
+    else:
+        clock = SMPClock(cpu_count, keep_completed=False)
+        clock.set_time_slice(time_slice)
+        clock.run(algorithm, read_workload(file_path))
+        summary, migrations = clock.summary(), sum(clock.migrations)
+    return {"algorithm": algorithm, "time_slice": time_slice, "cpu_count": cpu_count, "time": clock.time,
+            "completed": summary["completed"], "throughput": summary["throughput"],
+            "utilization": summary["utilization"], "context_switches": summary["context_switches"],
+            "migrations": migrations,
+            "turnaround_mean": summary["turnaround"]["mean"], "turnaround_p99": summary["turnaround"]["p99"],
+            "waiting_mean": summary["waiting"]["mean"], "waiting_p99": summary["waiting"]["p99"],
+            "response_mean": summary["response"]["mean"], "response_p99": summary["response"]["p99"]}
+
+
+def sweep(file_path, algorithms, time_slices=(2,), cpu_counts=(1,), processes=None):
+    """对 (算法, 时间片, CPU数) 的所有组合回放同一工作负载，返回结果表（字典列表）
+
+    各组合在进程池中并行运行，结果按参数组合的顺序返回，与并行度无关。
+    processes 为进程数，默认使用全部CPU核心，为 1 时在当前进程中依次运行。
+    """
+    for algorithm in algorithms:
+        if algorithm not in Simulator.SORT_KEYS:
+            raise ValueError(f"未知调度算法: {algorithm}")
+    if any(time_slice <= 0 for time_slice in time_slices):
+        raise ValueError("时间片必须大于0")
+    configs = [(file_path, algorithm, time_slice, cpu_count)
+               for algorithm, time_slice, cpu_count in itertools.product(algorithms, time_slices, cpu_counts)]
+    if processes == 1 or len(configs) <= 1:
+        return [_run_sweep_config(config) for config in configs]
+    with multiprocessing.Pool(processes) as pool:
+        return pool.map(_run_sweep_config, configs, chunksize=1)
+
+
+def write_sweep_results(rows, file=sys.stdout):
+    """把参数扫描结果写成CSV"""
+    writer = csv.DictWriter(file, fieldnames=SWEEP_COLUMNS)
+    writer.writeheader()
+    writer.writerows(rows)
+
+
+# 批量刷新的日志输出
+class LogSink:
+    """日志先写入有界环形缓冲区，再由 after 定时器成批写入 Text 控件
+
+    连续重复的消息合并为一行并标注次数；缓冲区满时丢弃最旧的消息并记录条数；
+    控件中最多保留 max_lines 行。verbose 为 False 时只显示摘要消息，忽略逐步调度的详细消息。
+    """
+
+    def __init__(self, widget, max_lines=2000, buffer_size=5000, flush_interval=100):
+        self.widget = widget
+        self.max_lines = max_lines  # 控件中最多保留的行数
+        self.flush_interval = flush_interval  # 刷新间隔（毫秒）
+        self.buffer = collections.deque(maxlen=buffer_size)  # 待刷新的消息，元素为 [消息, 重复次数]
+        self.dropped = 0  # 因缓冲区满而丢弃的消息数
+        self.verbose = True  # 是否显示详细消息
+        self._scheduled = False  # 是否已安排刷新
+
+    def write(self, message, detail=False):
+        """写入一条消息，detail 为 True 表示逐步调度的详细消息"""
+        if detail and not self.verbose:
+            return
+        if self.buffer and self.buffer[-1][0] == message:
+            self.buffer[-1][1] += 1  # 与上一条相同，合并
+        else:
+            if len(self.buffer) == self.buffer.maxlen:
+                self.dropped += self.buffer[0][1]
+            self.buffer.append([message, 1])
+        if not self._scheduled:
+            self._scheduled = True
+            self.widget.after(self.flush_interval, self.flush)
+
+    def flush(self):
+        """把缓冲区中的消息一次性写入控件，并裁剪超出上限的旧行"""
+        self._scheduled = False
+        if not self.buffer:
+            return
+        lines = [f"...省略 {self.dropped} 条日志..."] if self.dropped else []
+        lines.extend(message if count == 1 else f"{message} (×{count})" for message, count in self.buffer)
+        self.buffer.clear()
+        self.dropped = 0
+        self.widget.configure(state="normal")
+        self.widget.insert(tk.END, "\n".join(lines) + "\n")
+        line_count = int(self.widget.index("end-1c").split(".")[0]) - 1
+        if line_count > self.max_lines:
+            self.widget.delete("1.0", f"{line_count - self.max_lines + 1}.0")
+        self.widget.configure(state="disabled")
+        self.widget.see(tk.END)
+
+    def clear(self):
+        """清空缓冲区和控件"""
+        self.buffer.clear()
+        self.dropped = 0
+        self.widget.configure(state="normal")
+        self.widget.delete(1.0, tk.END)
+        self.widget.configure(state="disabled")
+
 
 # 进程管理模拟系统的GUI应用
 class ProcessManagerApp:
@@ -105,6 +1143,7 @@ class ProcessManagerApp:
 
         self.clock = Clock()  # 创建时钟实例
         self.scheduler_algorithm = tk.StringVar(value="fcfs")  # 默认调度算法为fcfs
+        self.log_level = tk.StringVar(value="详细")  # 日志级别
 
         # 初始化界面组件
         self.setup_gui()
@@ -117,13 +1156,14 @@ class ProcessManagerApp:
 
         tk.Label(frame_controls, text="选择调度算法:").pack(side=tk.LEFT)
         self.scheduler_combobox = ttk.Combobox(frame_controls, textvariable=self.scheduler_algorithm,
-                                                 values=["fcfs", "rr", "priority", "sjf", "srtf"],
+                                                 values=["fcfs", "rr", "priority", "sjf", "srtf", "cfs", "mlfq"],
                                                  state="readonly")
         self.scheduler_combobox.pack(side=tk.LEFT, padx=5)
         self.scheduler_combobox.bind("<<ComboboxSelected>>", self.clear_log)  # 绑定算法选择事件
 
         tk.Button(frame_controls, text="设置时间片", command=self.set_time_slice).pack(side=tk.LEFT, padx=5)
         tk.Button(frame_controls, text="推进时间", command=self.advance_time).pack(side=tk.LEFT, padx=5)
+        tk.Button(frame_controls, text="运行至结束", command=self.run_to_completion).pack(side=tk.LEFT, padx=5)
 
         # 进程创建面板
         frame_process = tk.Frame(self.root)
@@ -134,31 +1174,39 @@ class ProcessManagerApp:
         self.entry_process.pack(side=tk.LEFT, padx=5)
 
         tk.Button(frame_process, text="创建进程", command=self.create_process).pack(side=tk.LEFT, padx=5)
+        tk.Button(frame_process, text="回放工作负载", command=self.replay_workload).pack(side=tk.LEFT, padx=5)
 
         # 日志面板，显示调度和进程信息
         frame_log = tk.Frame(self.root)
         frame_log.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
 
-        tk.Label(frame_log, text="日志:").pack(anchor=tk.W)
+        frame_log_header = tk.Frame(frame_log)
+        frame_log_header.pack(fill=tk.X)
+        tk.Label(frame_log_header, text="日志:").pack(side=tk.LEFT)
+        log_level_combobox = ttk.Combobox(frame_log_header, textvariable=self.log_level, values=["详细", "仅摘要"],
+                                          state="readonly", width=8)
+        log_level_combobox.pack(side=tk.RIGHT)
+        log_level_combobox.bind("<<ComboboxSelected>>", self.set_log_level)  # 绑定日志级别选择事件
+        tk.Label(frame_log_header, text="日志级别:").pack(side=tk.RIGHT)
         self.text_log = tk.Text(frame_log, state="disabled", height=15)  # 禁用的Text控件显示日志
         self.text_log.pack(fill=tk.BOTH, expand=True)
+        self.log_sink = LogSink(self.text_log)  # 日志批量写入控件
 
-    def log(self, message):
-        """向日志窗口添加信息"""
-        self.text_log.configure(state="normal")
-        self.text_log.insert(tk.END, message + "\n")
-        self.text_log.configure(state="disabled")
-        self.text_log.see(tk.END)
+    def log(self, message, detail=False):
+        """向日志窗口添加信息，detail 为 True 表示逐步调度的详细信息"""
+        self.log_sink.write(message, detail)
 
     def clear_log(self, event=None):
         """清空日志"""
-        self.text_log.configure(state="normal")
-        self.text_log.delete(1.0, tk.END)
-        self.text_log.configure(state="disabled")
+        self.log_sink.clear()
+
+    def set_log_level(self, event=None):
+        """切换日志级别，"仅摘要"时不显示逐步调度的详细信息"""
+        self.log_sink.verbose = self.log_level.get() == "详细"
 
     def set_time_slice(self):
-        """设置时间片，只有在选择轮转调度算法时才允许设置"""
-        if self.scheduler_algorithm.get() == "rr":
+        """设置时间片，只有在选择轮转或完全公平调度算法时才允许设置"""
+        if self.scheduler_algorithm.get() in ("rr", "cfs"):
             time_slice = tk.simpledialog.askinteger("设置时间片", "请输入时间片大小:")  # 弹出输入框让用户输入时间片
             if time_slice is not None and time_slice > 0:
                 self.clock.set_time_slice(time_slice)  # 设置时钟的时间片大小
@@ -171,25 +1219,38 @@ class ProcessManagerApp:
     def advance_time(self):
         """推进时间，根据选择的调度算法进行进程调度"""
         algorithm = self.scheduler_algorithm.get()  # 获取当前选择的调度算法
-        if algorithm == "fcfs":
-            result = self.clock.fcfs()  # 执行FCFS调度
-        elif algorithm == "rr":
-            result = self.clock.rr()  # 执行轮转调度
-        elif algorithm == "priority":
-            result = self.clock.priority_scheduling()  # 执行优先级调度
-        elif algorithm == "sjf":
-            result = self.clock.sjf()  # 执行最短作业优先调度
-        elif algorithm == "srtf":
-            result = self.clock.srtf()  # 执行最短剩余时间优先调度
-        else:
-            result = "未知调度算法"
-        self.log(result)
+        self.log(self.clock.schedule(algorithm), detail=True)
+
+    def run_to_completion(self):
+        """用离散事件引擎一次性运行完就绪队列中的全部进程"""
+        finished = len(self.clock.completed)
+        simulator = Simulator(self.clock, self.scheduler_algorithm.get())
+        simulator.run_to_completion()
+        self.log(f"运行结束: 时间={self.clock.time}, 事件数={simulator.events}, "
+                 f"完成进程数={len(self.clock.completed) - finished}")
+
+    def replay_workload(self):
+        """选择工作负载文件，用当前调度算法回放"""
+        file_path = filedialog.askopenfilename(title="选择工作负载文件",
+                                               filetypes=[("Workload Files", "*.csv *.bin"), ("All Files", "*.*")])
+        if not file_path:
+            return
+        try:
+            simulator = replay_workload(file_path, self.scheduler_algorithm.get(), self.clock.time_slice)
+        except (OSError, ValueError) as e:
+            self.log(f"回放失败: {e}")
+            return
+        summary = simulator.clock.summary()
+        self.log(f"回放结束: 时间={simulator.clock.time}, 事件数={simulator.events}, "
+                 f"完成进程数={simulator.clock.completed_count}, "
+                 f"平均周转时间={summary['turnaround']['mean']:.2f}, 平均等待时间={summary['waiting']['mean']:.2f}, "
+                 f"平均响应时间={summary['response']['mean']:.2f}, 上下文切换={summary['context_switches']}")
 
     def create_process(self):
         """根据输入框内容创建新进程"""
         try:
             pid, priority, burst_time = map(int, self.entry_process.get().split())  # 解析输入
-            pcb = Process(pid, priority, burst_time)  # 创建新进程
+            pcb = Process(pid, priority, burst_time, self.clock.time)  # 创建新进程，到达时间为当前时间
             self.clock.add_process(pcb)  # 将进程加入时钟的就绪队列
             self.log(f"已创建进程: {pcb}")
             self.entry_process.delete(0, tk.END)  # 清空输入框
@@ -198,8 +1259,36 @@ class ProcessManagerApp:
             self.entry_process.delete(0, tk.END)  # 清空输入框
 
 
+def main(argv=None):
+    """不带参数时启动图形界面；带 sweep 子命令时在命令行运行参数扫描"""
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        root = tk.Tk()  # 创建主窗口
+        app = ProcessManagerApp(root)  # 创建进程管理应用
+        root.mainloop()  # 进入主循环，等待用户操作
+        return
+
+    parser = argparse.ArgumentParser(description="进程调度参数扫描")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    sweep_parser = subparsers.add_parser("sweep", help="对调度算法、时间片和CPU数的组合回放工作负载")
+    sweep_parser.add_argument("workload", help="工作负载文件（.csv 或 .bin）")
+    sweep_parser.add_argument("--algorithms", nargs="+", default=list(Simulator.SORT_KEYS), help="调度算法")
+    sweep_parser.add_argument("--time-slices", nargs="+", type=int, default=[2], help="时间片大小")
+    sweep_parser.add_argument("--cpus", nargs="+", type=int, default=[1], help="CPU数")
+    sweep_parser.add_argument("--jobs", type=int, default=None, help="并行进程数，默认为CPU核心数")
+    sweep_parser.add_argument("--output", help="结果CSV文件，默认输出到标准输出")
+    args = parser.parse_args(argv)
+    if min(args.time_slices) <= 0:
+        sweep_parser.error("--time-slices 必须大于0")
+
+    rows = sweep(args.workload, args.algorithms, args.time_slices, args.cpus, args.jobs)
+    if args.output:
+        with open(args.output, "w", newline="") as file:
+            write_sweep_results(rows, file)
+    else:
+        write_sweep_results(rows)
+
+
 # 主程序启动
 if __name__ == "__main__":
-    root = tk.Tk()  # 创建主窗口
-    app = ProcessManagerApp(root)  # 创建进程管理应用
-    root.mainloop()  # 进入主循环，等待用户操作
+    main()
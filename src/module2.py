@@ -1,12 +1,26 @@
+import argparse
+import csv
+import functools
+import json
+import random
+import re
+import sys
+import time
 import tkinter as tk
-from tkinter import ttk
+from tkinter import filedialog, ttk
+
+from histogram import Histogram
+
+# GUI labels for the variable partition placement and compaction policies
+FIT_POLICIES = {"首次适应": "first", "最佳适应": "best", "最坏适应": "worst", "循环首次适应": "next"}
+COMPACTION_POLICIES = {"不紧凑": None, "完全紧凑": "full", "部分紧凑": "partial", "增量紧凑": "incremental"}
 
 
 class MemoryManagerGUI:
     def __init__(self, master):
         self.master = master
         self.master.title("内存管理模拟系统")
-        self.manager = MemoryManager()
+        self.manager = MemoryManager(metrics=True)  # for the export button
         self.create_widgets()
 
     def create_widgets(self):
@@ -14,7 +28,8 @@ class MemoryManagerGUI:
         self.main_frame.pack(padx=10, pady=10, fill=tk.X)
 
         tk.Label(self.main_frame, text="选择内存分配方式：", font=("Arial", 14)).pack(side=tk.LEFT)
-        self.allocation_mode = ttk.Combobox(self.main_frame, values=["固定分区方式", "可变分区方式"], state="readonly")
+        self.allocation_mode = ttk.Combobox(self.main_frame, values=["固定分区方式", "可变分区方式", "伙伴系统方式", "Slab分配方式", "位图分配方式"],
+                                            state="readonly")
         self.allocation_mode.current(0)
         self.allocation_mode.pack(side=tk.LEFT, padx=5)
         self.allocation_mode.bind("<<ComboboxSelected>>", self.update_mode)
@@ -33,6 +48,22 @@ class MemoryManagerGUI:
         self.show_button = tk.Button(self.operation_frame, text="显示分配表", state="normal", command=self.show_table)
         self.show_button.pack(side=tk.LEFT, padx=5)
 
+        self.export_button = tk.Button(self.operation_frame, text="导出统计", command=self.export_metrics)
+        self.export_button.pack(side=tk.LEFT, padx=5)
+
+        tk.Label(self.operation_frame, text="分配策略：").pack(side=tk.LEFT, padx=(20, 0))
+        self.fit_policy = ttk.Combobox(self.operation_frame, values=list(FIT_POLICIES), state="readonly", width=12)
+        self.fit_policy.current(0)
+        self.fit_policy.pack(side=tk.LEFT, padx=5)
+        self.fit_policy.bind("<<ComboboxSelected>>", self.update_fit_policy)
+
+        tk.Label(self.operation_frame, text="紧凑策略：").pack(side=tk.LEFT, padx=(20, 0))
+        self.compaction = ttk.Combobox(self.operation_frame, values=list(COMPACTION_POLICIES), state="readonly",
+                                       width=10)
+        self.compaction.current(0)
+        self.compaction.pack(side=tk.LEFT, padx=5)
+        self.compaction.bind("<<ComboboxSelected>>", self.update_compaction)
+
         self.entry_frame = tk.Frame(self.master)
         self.entry_frame.pack(padx=10, pady=5, fill=tk.X)
 
@@ -60,6 +91,14 @@ class MemoryManagerGUI:
             self.setup_fixed_partition_mode()
         elif mode == "可变分区方式":
             self.setup_variable_partition_mode()
+        elif mode in ("伙伴系统方式", "Slab分配方式", "位图分配方式"):
+            self.setup_variable_partition_mode()
+
+    def update_fit_policy(self, event):
+        self.manager.fit_policy = FIT_POLICIES[self.fit_policy.get()]
+
+    def update_compaction(self, event):
+        self.manager.compaction = COMPACTION_POLICIES[self.compaction.get()]
 
     def setup_fixed_partition_mode(self):
         self.allocate_button.config(state="normal")
@@ -95,6 +134,27 @@ class MemoryManagerGUI:
             except ValueError:
                 self.display_message("请输入有效的作业大小！")
                 return
+        elif mode == "伙伴系统方式":
+            try:
+                size = float(self.size_entry.get())
+                self.manager.allocate_buddy(job_name, size)
+            except ValueError:
+                self.display_message("请输入有效的作业大小！")
+                return
+        elif mode == "Slab分配方式":
+            try:
+                size = float(self.size_entry.get())
+                self.manager.allocate_slab(job_name, size)
+            except ValueError:
+                self.display_message("请输入有效的作业大小！")
+                return
+        elif mode == "位图分配方式":
+            try:
+                size = float(self.size_entry.get())
+                self.manager.allocate_bitmap(job_name, size)
+            except ValueError:
+                self.display_message("请输入有效的作业大小！")
+                return
 
         self.show_table()
         self.clear_input_fields()
@@ -107,6 +167,12 @@ class MemoryManagerGUI:
             self.manager.release_fixed(job_name)
         elif mode == "可变分区方式":
             self.manager.release_variable(job_name)
+        elif mode == "伙伴系统方式":
+            self.manager.release_buddy(job_name)
+        elif mode == "Slab分配方式":
+            self.manager.release_slab(job_name)
+        elif mode == "位图分配方式":
+            self.manager.release_bitmap(job_name)
 
         self.show_table()
         self.clear_input_fields()
@@ -120,9 +186,22 @@ class MemoryManagerGUI:
             self.manager.display_fixed_table_gui(self.text_box)
         elif mode == "可变分区方式":
             self.manager.display_variable_table_gui(self.text_box)
+        elif mode == "伙伴系统方式":
+            self.manager.display_buddy_table_gui(self.text_box)
+        elif mode == "Slab分配方式":
+            self.manager.display_slab_table_gui(self.text_box)
+        elif mode == "位图分配方式":
+            self.manager.display_bitmap_table_gui(self.text_box)
 
         self.text_box.config(state="disabled")
 
+    def export_metrics(self):
+        file_path = filedialog.asksaveasfilename(defaultextension=".json",
+                                                 filetypes=[("JSON", "*.json"), ("CSV", "*.csv")])
+        if file_path:
+            self.manager.write_metrics(file_path)
+            self.display_message(f"统计已导出到 {file_path}")
+
     def clear_input_fields(self):
         self.job_name_entry.delete(0, tk.END)
         self.size_entry.delete(0, tk.END)
@@ -133,15 +212,717 @@ class MemoryManagerGUI:
         self.text_box.config(state="disabled")
 
 
-class MemoryManager:
+class FreeBlockTree:
+    """Treap of free blocks ordered by key; every node also keeps the largest block size in its subtree,
+    so "lowest key whose block is big enough" is a single O(log n) descent."""
+
+    class _Node:
+        __slots__ = ("key", "size", "priority", "left", "right", "max_size")
+
+        def __init__(self, key, size):
+            self.key = key
+            self.size = size
+            self.priority = random.random()
+            self.left = None
+            self.right = None
+            self.max_size = size
+
+    def __init__(self):
+        self.root = None
+        self.count = 0
+        self.steps = 0  # nodes visited by the last ceiling / first_fit search
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        # In-order walk with an explicit stack
+        stack, node = [], self.root
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node
+            node = node.right
+
+    @staticmethod
+    def _update(node):
+        node.max_size = node.size
+        if node.left and node.left.max_size > node.max_size:
+            node.max_size = node.left.max_size
+        if node.right and node.right.max_size > node.max_size:
+            node.max_size = node.right.max_size
+
+    def _split(self, node, key):
+        # Returns (keys < key, keys >= key)
+        if node is None:
+            return None, None
+        if node.key < key:
+            node.right, right = self._split(node.right, key)
+            self._update(node)
+            return node, right
+        left, node.left = self._split(node.left, key)
+        self._update(node)
+        return left, node
+
+    def _merge(self, left, right):
+        if left is None:
+            return right
+        if right is None:
+            return left
+        if left.priority > right.priority:
+            left.right = self._merge(left.right, right)
+            self._update(left)
+            return left
+        right.left = self._merge(left, right.left)
+        self._update(right)
+        return right
+
+    def insert(self, key, size):
+        left, right = self._split(self.root, key)
+        self.root = self._merge(self._merge(left, self._Node(key, size)), right)
+        self.count += 1
+
+    def remove(self, key):
+        self.root = self._remove(self.root, key)
+        self.count -= 1
+
+    def _remove(self, node, key):
+        if node is None:
+            raise KeyError(key)
+        if key < node.key:
+            node.left = self._remove(node.left, key)
+        elif node.key < key:
+            node.right = self._remove(node.right, key)
+        else:
+            return self._merge(node.left, node.right)
+        self._update(node)
+        return node
+
+    def floor(self, key):
+        # Node with the largest key <= key
+        node, found = self.root, None
+        while node:
+            if key < node.key:
+                node = node.left
+            else:
+                found = node
+                node = node.right
+        return found
+
+    def ceiling(self, key):
+        # Node with the smallest key >= key
+        node, found, steps = self.root, None, 0
+        while node:
+            steps += 1
+            if node.key < key:
+                node = node.right
+            else:
+                found = node
+                node = node.left
+        self.steps = steps
+        return found
+
+    def max_size(self):
+        return self.root.max_size if self.root else 0
+
+    def first_fit(self, size, lower=None):
+        # Node with the smallest key (>= lower if given) whose size is at least size
+        if lower is None:
+            return self._first_fit(self.root, size)
+        left, right = self._split(self.root, lower)
+        found = self._first_fit(right, size)
+        self.root = self._merge(left, right)
+        return found
+
+    def _first_fit(self, node, size):
+        self.steps = 1
+        if node is None or node.max_size < size:
+            return None
+        while True:
+            if node.left and node.left.max_size >= size:
+                node = node.left
+            elif node.size >= size:
+                return node
+            else:
+                node = node.right
+            self.steps += 1
+
+
+class BuddyAllocator:
+    """Binary buddy allocator over [base, base + size). The region is split into the largest aligned
+    power-of-two blocks it holds, so sizes that are not a power of two (such as 124K) work too."""
+
+    def __init__(self, base, size, min_block=1):
+        units = size / min_block
+        if units != int(units) or units <= 0:
+            raise ValueError("区域大小必须是最小块大小的正整数倍")
+        self.base = base
+        self.min_block = min_block
+        self.units = int(units)
+        self.max_order = self.units.bit_length() - 1
+        # free_lists[order] holds the offsets (in min_block units) of free blocks of 2**order units;
+        # dicts keep insertion order, so popitem() hands out the most recently freed block
+        self.free_lists = [{} for _ in range(self.max_order + 1)]
+        self.allocations = {}  # job name -> (offset, order, requested size)
+        self.wasted = 0  # internal fragmentation of the current allocations
+        self.steps = 0  # free lists looked at by the last allocation
+        offset = 0
+        for order in range(self.max_order, -1, -1):
+            if self.units & (1 << order):
+                self.free_lists[order][offset] = None
+                offset += 1 << order
+
+    def order_for(self, size):
+        units = max(1, -int(-size // self.min_block))  # ceil(size / min_block)
+        return (units - 1).bit_length()
+
+    def allocate(self, job_name, size):
+        order = self.order_for(size)
+        for current in range(order, self.max_order + 1):
+            if self.free_lists[current]:
+                break
+        else:
+            self.steps = self.max_order + 1 - order
+            return None
+        self.steps = current - order + 1
+        offset, _ = self.free_lists[current].popitem()
+        while current > order:
+            # Split, keep the lower half and free the upper buddy
+            current -= 1
+            self.free_lists[current][offset + (1 << current)] = None
+        self.allocations[job_name] = (offset, order, size)
+        self.wasted += self.block_size(order) - size
+        return self.base + offset * self.min_block
+
+    def release(self, job_name):
+        offset, order, size = self.allocations.pop(job_name)
+        self.wasted -= self.block_size(order) - size
+        while order < self.max_order:
+            buddy = offset ^ (1 << order)
+            if buddy not in self.free_lists[order]:
+                break
+            del self.free_lists[order][buddy]
+            offset = min(offset, buddy)
+            order += 1
+        self.free_lists[order][offset] = None
+
+    def block_size(self, order):
+        return (1 << order) * self.min_block
+
+    def free_blocks(self):
+        return sorted((self.base + offset * self.min_block, self.block_size(order))
+                      for order, free in enumerate(self.free_lists) for offset in free)
+
+    def allocated_blocks(self):
+        return [(self.base + offset * self.min_block, self.block_size(order), size, job)
+                for job, (offset, order, size) in self.allocations.items()]
+
+    def internal_fragmentation(self):
+        return self.wasted
+
+
+class Slab:
+    __slots__ = ("name", "start", "object_size", "capacity", "free")
+
+    def __init__(self, name, start, object_size, capacity):
+        self.name = name  # job name of the slab in the variable partition tables
+        self.start = start
+        self.object_size = object_size
+        self.capacity = capacity
+        self.free = list(range(capacity - 1, -1, -1))  # free object slots, used as a stack
+
+    @property
+    def used(self):
+        return self.capacity - len(self.free)
+
+
+class SlabAllocator:
+    """Segregated size-class allocator. Each class hands out fixed-size objects from slabs, and slabs
+    are carved out of the variable partition area, so a request that fits a class never splits or
+    coalesces free blocks."""
+
+    def __init__(self, manager, size_classes=(1, 2, 4, 8), slab_size=16):
+        if any(slab_size < size for size in size_classes):
+            raise ValueError("Slab大小不能小于对象大小")
+        self.manager = manager
+        self.size_classes = sorted(size_classes)
+        self.slab_size = slab_size
+        self.slabs = {size: {} for size in self.size_classes}  # every slab of each class, as ordered sets
+        self.partial = {size: {} for size in self.size_classes}  # slabs with free slots, as ordered sets
+        self.allocations = {}  # job name -> (slab, slot, requested size); slab is None for large jobs
+        self.slab_count = 0
+        self.wasted = 0  # unused bytes of the objects handed out
+
+    def size_class(self, size):
+        for class_size in self.size_classes:
+            if size <= class_size:
+                return class_size
+        return None
+
+    def allocate(self, job_name, size):
+        class_size = self.size_class(size)
+        if class_size is None:
+            # Too big for any class, fall back to the variable partition allocator
+            if not self.manager._allocate_variable(job_name, size):
+                return None
+            self.allocations[job_name] = (None, None, size)
+            return self.manager.allocations[job_name][0]
+        partial = self.partial[class_size]
+        if partial:
+            slab = next(iter(partial))
+        else:
+            slab = self.grow(class_size)
+            if slab is None:
+                return None
+        slot = slab.free.pop()
+        if not slab.free:
+            del partial[slab]
+        self.allocations[job_name] = (slab, slot, size)
+        self.wasted += class_size - size
+        return slab.start + slot * class_size
+
+    def grow(self, class_size):
+        self.slab_count += 1
+        name = f"slab-{class_size}K-{self.slab_count}"
+        if not self.manager._allocate_variable(name, self.slab_size):
+            return None
+        start, _ = self.manager.allocations[name]
+        slab = Slab(name, start, class_size, int(self.slab_size // class_size))
+        self.slabs[class_size][slab] = None
+        self.partial[class_size][slab] = None
+        return slab
+
+    def release(self, job_name):
+        slab, slot, size = self.allocations.pop(job_name)
+        if slab is None:
+            self.manager._release_variable(job_name)
+            return
+        self.wasted -= slab.object_size - size
+        slab.free.append(slot)
+        partial = self.partial[slab.object_size]
+        if slab.used == 0:
+            # Hand the empty slab back to the variable partition area
+            partial.pop(slab, None)
+            del self.slabs[slab.object_size][slab]
+            self.manager._release_variable(slab.name)
+        else:
+            partial[slab] = None
+
+    def allocated_objects(self):
+        result = []
+        for job, (slab, slot, size) in self.allocations.items():
+            if slab is None:
+                result.append((self.manager.allocations[job][0], size, "-", job))
+            else:
+                result.append((slab.start + slot * slab.object_size, size, slab.object_size, job))
+        return result
+
+    def occupancy(self):
+        # (class size, slab count, used objects, total objects) per class
+        return [(size, len(slabs), sum(slab.used for slab in slabs), sum(slab.capacity for slab in slabs))
+                for size, slabs in self.slabs.items()]
+
+
+class BitmapAllocator:
+    """Allocator for large memories: one bit per allocation unit in a packed bytearray (bit i of the
+    bitmap is unit i, 1 = in use). Searching for k free units turns a window of the bitmap into one big
+    integer and folds it with shifts and ANDs, so the scan runs in C over machine words instead of per unit."""
+
+    WINDOW_BYTES = 4096  # bitmap bytes searched per step
+    NOT_FULL = re.compile(b"[^\xff]")  # first byte with at least one free unit
+
+    def __init__(self, total_memory, unit_size=4, reserved=0):
+        units = total_memory / unit_size
+        if units != int(units) or units <= 0:
+            raise ValueError("内存大小必须是分配单位的正整数倍")
+        self.unit_size = unit_size
+        self.units = int(units)
+        self.bitmap = bytearray((self.units + 7) // 8)
+        self.used_units = 0
+        self.allocations = {}  # job name -> (first unit, unit count)
+        self.steps = 0  # windows scanned by the last find_run
+        if reserved:
+            self.mark(0, self.units_for(reserved), True)
+            self.used_units = self.units_for(reserved)
+
+    def units_for(self, size):
+        return max(1, -int(-size // self.unit_size))  # ceil(size / unit_size)
+
+    def mark(self, first, count, used):
+        # Set or clear bits [first, first + count): whole bytes by slice assignment, edges by masks
+        end = first + count
+        head, tail = (first + 7) // 8, end // 8
+        if head > tail:  # the whole range lies inside one byte
+            mask = ((1 << count) - 1) << (first % 8)
+            self._mask_byte(first // 8, mask, used)
+            return
+        if first % 8:
+            self._mask_byte(first // 8, (0xFF << (first % 8)) & 0xFF, used)
+        self.bitmap[head:tail] = (b"\xff" if used else b"\x00") * (tail - head)
+        if end % 8:
+            self._mask_byte(tail, (1 << (end % 8)) - 1, used)
+
+    def _mask_byte(self, index, mask, used):
+        if used:
+            self.bitmap[index] |= mask
+        else:
+            self.bitmap[index] &= ~mask & 0xFF
+
+    def free_mask(self):
+        # Big integer with bit i set when unit i is free
+        return ~int.from_bytes(self.bitmap, "little") & ((1 << self.units) - 1)
+
+    def find_run(self, count):
+        # Lowest unit that starts `count` free units, or None. Windows overlap by count bits so that
+        # runs crossing a window boundary are still seen; fully used bytes at the front are skipped.
+        self.steps = 0
+        match = self.NOT_FULL.search(self.bitmap)
+        if match is None:
+            return None
+        overlap = (count + 7) // 8 + 1
+        window = max(self.WINDOW_BYTES, overlap)
+        start = match.start()
+        while start * 8 < self.units:
+            self.steps += 1
+            end = min(start + window + overlap, len(self.bitmap))
+            bits = min(end * 8, self.units) - start * 8
+            runs = ~int.from_bytes(self.bitmap[start:end], "little") & ((1 << bits) - 1)
+            span = 1
+            while span < count and runs:
+                # After this step bit i is set iff units i .. i + span + step - 1 are all free
+                step = min(span, count - span)
+                runs &= runs >> step
+                span += step
+            if runs:
+                return start * 8 + (runs & -runs).bit_length() - 1
+            start += window
+        return None
+
+    def allocate(self, job_name, size):
+        count = self.units_for(size)
+        first = self.find_run(count)
+        if first is None:
+            return None
+        self.mark(first, count, True)
+        self.used_units += count
+        self.allocations[job_name] = (first, count)
+        return first * self.unit_size
+
+    def release(self, job_name):
+        first, count = self.allocations.pop(job_name)
+        self.mark(first, count, False)
+        self.used_units -= count
+
+    def allocate_many(self, jobs):
+        # Bulk allocation of (job name, size) pairs; returns the names that did not fit
+        return [job_name for job_name, size in jobs if self.allocate(job_name, size) is None]
+
+    def release_many(self, job_names):
+        for job_name in job_names:
+            self.release(job_name)
+
+    def largest_free_run(self):
+        # Binary search on the run length; find_run succeeds for every length up to the answer
+        low, high = 0, self.units - self.used_units
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self.find_run(middle) is None:
+                high = middle - 1
+            else:
+                low = middle
+        return low
+
+    def free_run_count(self):
+        free = self.free_mask()
+        return (free & ~(free << 1)).bit_count()  # units that start a run
+
+    def free_runs(self, limit=None):
+        # (start address, size) of free runs in address order, at most `limit` of them
+        runs, free, position = [], self.free_mask(), 0
+        while free and (limit is None or len(runs) < limit):
+            skip = (free & -free).bit_length() - 1
+            free >>= skip
+            length = (~free & (free + 1)).bit_length() - 1  # trailing ones
+            runs.append(((position + skip) * self.unit_size, length * self.unit_size))
+            free >>= length
+            position += skip + length
+        return runs
+
+
+class OperationStats:
+    __slots__ = ("count", "failures", "steps", "max_steps", "latency")
+
+    def __init__(self):
+        self.count = 0
+        self.failures = 0
+        self.steps = 0  # free-list search steps summed over all allocations
+        self.max_steps = 0
+        self.latency = Histogram()  # nanoseconds per call, for the sampled calls only
+
+
+class AllocatorMetrics:
+    """Counters per (mode, operation), updated in O(1) on every allocate and release. Only one call in
+    LATENCY_SAMPLE is timed into the latency histogram, which keeps the clock reads and the histogram
+    update off most calls."""
+
+    LATENCY_SAMPLE = 16  # a power of two
+    COLUMNS = ("mode", "operation", "count", "failures", "latency_mean_ns", "latency_p50_ns", "latency_p90_ns",
+               "latency_p99_ns", "latency_max_ns", "steps_mean", "steps_max")
+
     def __init__(self):
-        self.total_memory = 128
-        self.os_memory = 4
+        self.operations = {}  # (mode, operation) -> OperationStats
+
+    def stats(self, mode, operation):
+        stats = self.operations.get((mode, operation))
+        if stats is None:
+            stats = self.operations[mode, operation] = OperationStats()
+        return stats
+
+    def modes(self):
+        return list(dict.fromkeys(mode for mode, _ in self.operations))
+
+    def rows(self):
+        rows = []
+        for (mode, operation), stats in self.operations.items():
+            latency = stats.latency.summary()
+            steps_mean = stats.steps / stats.count if stats.count else 0.0
+            rows.append(dict(zip(self.COLUMNS, (
+                mode, operation, stats.count, stats.failures, round(latency["mean"]), latency["p50"],
+                latency["p90"], latency["p99"], latency["max"], round(steps_mean, 2), stats.max_steps))))
+        return rows
+
+
+def instrumented(mode, operation):
+    # Counts an allocate/release method into manager.metrics and times a sample of the calls; allocations
+    # also add up manager.search_steps. With manager.metrics set to None the method is called directly
+    key = (mode, operation)
+    allocation = operation == "allocate"
+    clock = time.perf_counter_ns
+    mask = AllocatorMetrics.LATENCY_SAMPLE - 1
+
+    def decorate(method):
+        @functools.wraps(method)
+        def timed(self, *args):
+            metrics = self.metrics
+            if metrics is None:
+                return method(self, *args)
+            stats = metrics.operations.get(key) or metrics.stats(mode, operation)
+            stats.count += 1
+            self.search_steps = 0
+            if stats.count & mask:
+                succeeded = method(self, *args)
+            else:
+                started = clock()
+                succeeded = method(self, *args)
+                stats.latency.record(clock() - started)
+            if allocation:
+                steps = self.search_steps
+                stats.steps += steps
+                if steps > stats.max_steps:
+                    stats.max_steps = steps
+            if not succeeded:
+                stats.failures += 1
+            return succeeded
+        return timed
+    return decorate
+
+
+class MemoryManager:
+    GAUGE_COLUMNS = ("free_total", "largest_free", "external_fragmentation", "free_list_length",
+                     "internal_fragmentation")
+
+    def __init__(self, total_memory=128, os_memory=4, unit_size=4, metrics=False):
+        self.total_memory = total_memory
+        self.os_memory = os_memory
         self.user_memory = self.total_memory - self.os_memory
-        self.fixed_partitions = [1, 1, 2, 4, 4, 8, 16, 88]
+        if self.user_memory <= 0:
+            raise ValueError("内存总大小必须大于操作系统占用的内存")
+        # Fixed partitions of 1, 1, 2, 4, 4, 8 and 16K plus the rest (88K for the default 128K); when the
+        # user area is too small for all of them, the layout stops early and the rest is the last partition
+        self.fixed_partitions = []
+        for size in (1, 1, 2, 4, 4, 8, 16):
+            if sum(self.fixed_partitions) + size >= self.user_memory:
+                break
+            self.fixed_partitions.append(size)
+        self.fixed_partitions.append(self.user_memory - sum(self.fixed_partitions))
         self.fixed_allocation = [None] * len(self.fixed_partitions)
-        self.variable_free = [(self.os_memory, self.user_memory)]
-        self.variable_allocated = []
+        self.fixed_job_sizes = [0] * len(self.fixed_partitions)
+        self.fixed_wasted = 0  # internal fragmentation of the occupied fixed partitions
+        self.fit_policy = "first"  # first / best / worst / next
+        # Free blocks indexed by start address (with subtree max sizes) and by (size, start)
+        self.free_by_address = FreeBlockTree()
+        self.free_by_size = FreeBlockTree()
+        self.free_total = 0
+        self.add_free_block(self.os_memory, self.user_memory)
+        self.allocations = {}  # job name -> (start, size), in allocation order
+        self.next_fit_start = self.os_memory  # where the next-fit search resumes
+        self.slab = SlabAllocator(self)
+        self.unit_size = unit_size
+        # The buddy and bitmap allocators are built on first use, since they need the user memory to be a
+        # whole number of K and total_memory to be a multiple of unit_size, which the other modes do not
+        self._buddy = None
+        self._bitmap = None
+        self.quiet = False  # batch replays turn the console warnings off
+        self.metrics = AllocatorMetrics() if metrics else None  # None turns the per-operation timing off
+        self.search_steps = 0  # set by the allocation paths for the metrics
+        # Compaction of the variable partition area: None, "full", "partial" (only until the request
+        # fits) or "incremental" (at most compaction_step moves per pass); it runs when an allocation
+        # fails but enough total space is free, or after a release pushes external fragmentation
+        # past compaction_threshold
+        self.compaction = None
+        self.compaction_threshold = None
+        self.compaction_step = 8
+        self.compaction_stats = {"compactions": 0, "moves": 0, "bytes_moved": 0, "seconds": 0.0, "rescued": 0}
+
+    @property
+    def buddy(self):
+        if self._buddy is None:
+            self._buddy = BuddyAllocator(self.os_memory, self.user_memory)
+        return self._buddy
+
+    @property
+    def bitmap(self):
+        if self._bitmap is None:
+            self._bitmap = BitmapAllocator(self.total_memory, self.unit_size, reserved=self.os_memory)
+        return self._bitmap
+
+    def warn(self, message):
+        if not self.quiet:
+            print(message)
+
+    @property
+    def variable_free(self):
+        return [(node.key, node.size) for node in self.free_by_address]
+
+    @property
+    def variable_allocated(self):
+        return [(start, size, job) for job, (start, size) in self.allocations.items()]
+
+    def add_free_block(self, start, size):
+        self.free_by_address.insert(start, size)
+        self.free_by_size.insert((size, start), size)
+        self.free_total += size
+
+    def remove_free_block(self, start, size):
+        self.free_by_address.remove(start)
+        self.free_by_size.remove((size, start))
+        self.free_total -= size
+
+    def external_fragmentation(self):
+        # 1 - largest free block / total free space of the variable partition area
+        return 1 - self.free_by_address.max_size() / self.free_total if self.free_total else 0.0
+
+    def compact(self, size=None, max_moves=None):
+        """Slides allocations down over the free space, starting at the lowest free block, and returns
+        the start of the free block this opens up. With size it stops as soon as that block is large
+        enough; with max_moves it stops after that many relocations. Slabs move with their objects."""
+        started = time.perf_counter()
+        first = next(iter(self.free_by_address), None)
+        if first is None:
+            return None
+        cursor = first.key
+        slabs = {slab.name: slab for slabs in self.slab.slabs.values() for slab in slabs}
+        stats = self.compaction_stats
+        moves = 0
+        end = self.os_memory + self.user_memory
+        for job, (start, job_size) in sorted(self.allocations.items(), key=lambda item: item[1][0]):
+            if start < cursor:
+                continue
+            if size is not None and start - cursor >= size or max_moves is not None and moves >= max_moves:
+                end = start
+                break
+            self.allocations[job] = (cursor, job_size)
+            if job in slabs:
+                slabs[job].start = cursor
+            moves += 1
+            stats["bytes_moved"] += job_size
+            cursor += job_size
+        # Every free block below the first allocation left in place merges into [cursor, end)
+        while True:
+            node = self.free_by_address.ceiling(0)
+            if node is None or node.key >= end:
+                break
+            self.remove_free_block(node.key, node.size)
+        following = self.free_by_address.ceiling(end)
+        if following is not None and following.key == end:
+            self.remove_free_block(following.key, following.size)
+            end += following.size
+        if end > cursor:
+            self.add_free_block(cursor, end - cursor)
+        self.next_fit_start = cursor
+        stats["compactions"] += 1
+        stats["moves"] += moves
+        stats["seconds"] += time.perf_counter() - started
+        return cursor
+
+    def find_free_block(self, size):
+        tree = self.free_by_address
+        if self.fit_policy == "best":
+            node = self.free_by_size.ceiling((size, float("-inf")))
+            self.search_steps += self.free_by_size.steps
+            return (node.key[1], node.size) if node else None
+        if self.fit_policy == "worst":
+            largest = tree.max_size()
+            node = tree.first_fit(largest) if largest >= size else None
+        elif self.fit_policy == "next":
+            node = tree.first_fit(size, self.next_fit_start)
+            if node is None:
+                self.search_steps += tree.steps
+                node = tree.first_fit(size)
+        else:
+            node = tree.first_fit(size)
+        self.search_steps += tree.steps
+        return (node.key, node.size) if node else None
+
+    def free_space(self, mode):
+        # (total free, largest free block) in K for one allocation mode
+        if mode == "fixed":
+            free = [size for size, job in zip(self.fixed_partitions, self.fixed_allocation) if not job]
+            return sum(free), max(free, default=0)
+        if mode in ("variable", "slab"):
+            return self.free_total, self.free_by_address.max_size()
+        if mode == "buddy":
+            buddy = self.buddy
+            orders = [order for order, free in enumerate(buddy.free_lists) if free]
+            total = sum(buddy.block_size(order) * len(buddy.free_lists[order]) for order in orders)
+            return total, buddy.block_size(orders[-1]) if orders else 0
+        if mode == "bitmap":
+            bitmap = self.bitmap
+            return ((bitmap.units - bitmap.used_units) * bitmap.unit_size,
+                    bitmap.largest_free_run() * bitmap.unit_size)
+        raise ValueError(f"未知分配方式: {mode}")
+
+    def gauges(self, mode):
+        # Point-in-time fragmentation figures for one mode, named as in GAUGE_COLUMNS. The variable, slab and
+        # fixed figures come from running counters and tree maxima; buddy sums its free lists and bitmap
+        # scans the whole bitmap, so those two cost more per call
+        free_total, largest = self.free_space(mode)
+        if mode == "fixed":
+            free_blocks, wasted = self.fixed_allocation.count(None), self.fixed_wasted
+        elif mode == "buddy":
+            free_blocks, wasted = sum(map(len, self.buddy.free_lists)), self.buddy.internal_fragmentation()
+        elif mode == "bitmap":
+            free_blocks, wasted = self.bitmap.free_run_count(), None
+        else:
+            free_blocks, wasted = len(self.free_by_address), self.slab.wasted if mode == "slab" else 0
+        return dict(zip(self.GAUGE_COLUMNS, (free_total, largest, 1 - largest / free_total if free_total else 0.0,
+                                             free_blocks, wasted)))
+
+    def write_metrics(self, file_path):
+        # JSON keeps operations and per-mode gauges apart; CSV puts the gauges of a mode on each of its rows
+        if self.metrics is None:
+            raise ValueError("未开启分配器统计")
+        modes = {mode: self.gauges(mode) for mode in self.metrics.modes()}
+        rows = self.metrics.rows()
+        with open(file_path, "w", newline="") as file:
+            if file_path.endswith(".json"):
+                json.dump({"operations": rows, "modes": modes}, file, ensure_ascii=False, indent=2)
+                return
+            writer = csv.DictWriter(file, fieldnames=AllocatorMetrics.COLUMNS + self.GAUGE_COLUMNS)
+            writer.writeheader()
+            writer.writerows({**row, **modes[row["mode"]]} for row in rows)
 
     def display_fixed_table_gui(self, text_box):
         text_box.insert(tk.END, "\n固定分区分配情况：\n")
@@ -150,22 +931,32 @@ class MemoryManager:
         for i, size in enumerate(self.fixed_partitions):
             status = self.fixed_allocation[i] if self.fixed_allocation[i] else "空闲"
             text_box.insert(tk.END, f"{i + 1}\t\t{size}\t\t{status}\n")
+        text_box.insert(tk.END, f"内部碎片：{self.fixed_wasted:.2f}K\n")
 
+    @instrumented("fixed", "allocate")
     def allocate_fixed(self, job_name, size):
-        # Allocating a floating-point size in fixed partitions
+        # Allocating a floating-point size in fixed partitions; the unused tail of the partition is
+        # internal fragmentation until the job is released
         for i in range(len(self.fixed_partitions)):
             if not self.fixed_allocation[i] and self.fixed_partitions[i] >= size:
                 self.fixed_allocation[i] = job_name
-                self.fixed_partitions[i] -= size  # Reduce the available memory in the partition
-                return
-        print("没有足够的固定分区空间！")
+                self.fixed_job_sizes[i] = size
+                self.fixed_wasted += self.fixed_partitions[i] - size
+                self.search_steps = i + 1
+                return True
+        self.search_steps = len(self.fixed_partitions)
+        self.warn("没有足够的固定分区空间！")
+        return False
 
+    @instrumented("fixed", "release")
     def release_fixed(self, job_name):
         for i in range(len(self.fixed_allocation)):
             if self.fixed_allocation[i] == job_name:
                 self.fixed_allocation[i] = None
-                return
-        print("未找到该作业！")
+                self.fixed_wasted -= self.fixed_partitions[i] - self.fixed_job_sizes[i]
+                return True
+        self.warn("未找到该作业！")
+        return False
 
     def display_variable_table_gui(self, text_box):
         text_box.insert(tk.END, "\n可变分区分配情况：\n")
@@ -177,39 +968,282 @@ class MemoryManager:
         text_box.insert(tk.END, "起始地址(K)\t大小(K)\n")
         for start, size in self.variable_free:
             text_box.insert(tk.END, f"{start}\t\t{size:.2f}\n")
+        if self.compaction_stats["compactions"]:
+            stats = self.compaction_stats
+            text_box.insert(tk.END, f"\n紧凑次数：{stats['compactions']}\t移动量：{stats['bytes_moved']:.2f}K\t"
+                                    f"耗时：{stats['seconds'] * 1000:.2f}ms\n")
 
-    def allocate_variable(self, job_name, size):
-        for i, (start, free_size) in enumerate(self.variable_free):
-            if free_size >= size:
-                self.variable_allocated.append((start, size, job_name))
-                if free_size > size:
-                    self.variable_free[i] = (start + size, free_size - size)
-                else:
-                    self.variable_free.pop(i)
-                return
-        print("没有足够的可用空间进行分配！")
-
-    def release_variable(self, job_name):
-        for i, (start, size, job) in enumerate(self.variable_allocated):
-            if job == job_name:
-                self.variable_allocated.pop(i)
-                self.variable_free.append((start, size))
-                self.variable_free.sort()
-                self.merge_free_space()
-                return
-        print("未找到该作业！")
+    def display_buddy_table_gui(self, text_box):
+        text_box.insert(tk.END, "\n伙伴系统分配情况：\n")
+        text_box.insert(tk.END, "已分配表：\n")
+        text_box.insert(tk.END, "起始地址(K)\t块大小(K)\t作业大小(K)\t作业\n")
+        for start, block, size, job in self.buddy.allocated_blocks():
+            text_box.insert(tk.END, f"{start}\t\t{block}\t\t{size:.2f}\t\t{job}\n")
+        text_box.insert(tk.END, f"内部碎片：{self.buddy.internal_fragmentation():.2f}K\n")
+        text_box.insert(tk.END, "\n空闲块表：\n")
+        text_box.insert(tk.END, "起始地址(K)\t大小(K)\n")
+        for start, block in self.buddy.free_blocks():
+            text_box.insert(tk.END, f"{start}\t\t{block}\n")
+
+    def display_slab_table_gui(self, text_box):
+        text_box.insert(tk.END, "\nSlab分配情况：\n")
+        text_box.insert(tk.END, "对象大小(K)\tSlab数\t已用对象\t对象总数\t占用率\n")
+        for size, slabs, used, total in self.slab.occupancy():
+            rate = used / total if total else 0
+            text_box.insert(tk.END, f"{size}\t\t{slabs}\t{used}\t\t{total}\t\t{rate:.0%}\n")
+        text_box.insert(tk.END, "\n已分配表：\n")
+        text_box.insert(tk.END, "起始地址(K)\t大小(K)\t对象大小(K)\t作业\n")
+        for start, size, object_size, job in self.slab.allocated_objects():
+            text_box.insert(tk.END, f"{start}\t\t{size:.2f}\t\t{object_size}\t\t{job}\n")
+
+    def display_bitmap_table_gui(self, text_box, limit=50):
+        bitmap = self.bitmap
+        text_box.insert(tk.END, "\n位图分配情况：\n")
+        text_box.insert(tk.END, f"分配单位：{bitmap.unit_size}K\t单位总数：{bitmap.units}\t"
+                                f"已用单位：{bitmap.used_units}\n")
+        text_box.insert(tk.END, "已分配表：\n")
+        text_box.insert(tk.END, "起始地址(K)\t大小(K)\t作业\n")
+        for job, (first, count) in list(bitmap.allocations.items())[:limit]:
+            text_box.insert(tk.END, f"{first * bitmap.unit_size}\t\t{count * bitmap.unit_size}\t\t{job}\n")
+        if len(bitmap.allocations) > limit:
+            text_box.insert(tk.END, f"...共 {len(bitmap.allocations)} 个作业\n")
+        text_box.insert(tk.END, "\n未分配表：\n")
+        text_box.insert(tk.END, "起始地址(K)\t大小(K)\n")
+        for start, size in bitmap.free_runs(limit):
+            text_box.insert(tk.END, f"{start}\t\t{size}\n")
+
+    @instrumented("bitmap", "allocate")
+    def allocate_bitmap(self, job_name, size):
+        if job_name in self.bitmap.allocations:
+            self.warn("该作业已分配空间！")
+            return False
+        found = self.bitmap.allocate(job_name, size)
+        self.search_steps = self.bitmap.steps
+        if found is None:
+            self.warn("没有足够的可用空间进行分配！")
+            return False
+        return True
 
-    def merge_free_space(self):
-        merged = []
-        for start, size in sorted(self.variable_free):
-            if merged and merged[-1][0] + merged[-1][1] == start:
-                merged[-1] = (merged[-1][0], merged[-1][1] + size)
+    @instrumented("bitmap", "release")
+    def release_bitmap(self, job_name):
+        if job_name not in self.bitmap.allocations:
+            self.warn("未找到该作业！")
+            return False
+        self.bitmap.release(job_name)
+        return True
+
+    @instrumented("slab", "allocate")
+    def allocate_slab(self, job_name, size):
+        if job_name in self.slab.allocations:
+            self.warn("该作业已分配空间！")
+            return False
+        if self.slab.allocate(job_name, size) is None:
+            self.warn("没有足够的可用空间进行分配！")
+            return False
+        return True
+
+    @instrumented("slab", "release")
+    def release_slab(self, job_name):
+        if job_name not in self.slab.allocations:
+            self.warn("未找到该作业！")
+            return False
+        self.slab.release(job_name)
+        return True
+
+    @instrumented("buddy", "allocate")
+    def allocate_buddy(self, job_name, size):
+        if job_name in self.buddy.allocations:
+            self.warn("该作业已分配空间！")
+            return False
+        found = self.buddy.allocate(job_name, size)
+        self.search_steps = self.buddy.steps
+        if found is None:
+            self.warn("没有足够的可用空间进行分配！")
+            return False
+        return True
+
+    @instrumented("buddy", "release")
+    def release_buddy(self, job_name):
+        if job_name not in self.buddy.allocations:
+            self.warn("未找到该作业！")
+            return False
+        self.buddy.release(job_name)
+        return True
+
+    def _allocate_variable(self, job_name, size):
+        if job_name in self.allocations:
+            self.warn("该作业已分配空间！")
+            return False
+        block = self.find_free_block(size)
+        if block is None and self.compaction and self.free_total >= size:
+            self.compact(size if self.compaction != "full" else None,
+                         self.compaction_step if self.compaction == "incremental" else None)
+            block = self.find_free_block(size)
+            if block is not None:
+                self.compaction_stats["rescued"] += 1
+        if block is None:
+            self.warn("没有足够的可用空间进行分配！")
+            return False
+        start, free_size = block
+        self.remove_free_block(start, free_size)
+        if free_size > size:
+            self.add_free_block(start + size, free_size - size)
+        self.allocations[job_name] = (start, size)
+        self.next_fit_start = start + size
+        return True
+
+    def _release_variable(self, job_name):
+        if job_name not in self.allocations:
+            self.warn("未找到该作业！")
+            return False
+        start, size = self.allocations.pop(job_name)
+        # Coalesce with the free neighbours on either side only
+        previous = self.free_by_address.floor(start)
+        if previous and previous.key + previous.size == start:
+            self.remove_free_block(previous.key, previous.size)
+            start, size = previous.key, previous.size + size
+        following = self.free_by_address.ceiling(start)
+        if following and start + size == following.key:
+            self.remove_free_block(following.key, following.size)
+            size += following.size
+        self.add_free_block(start, size)
+        if (self.compaction and self.compaction_threshold is not None
+                and self.external_fragmentation() > self.compaction_threshold):
+            self.compact(max_moves=self.compaction_step if self.compaction == "incremental" else None)
+        return True
+
+    # The slab allocator carves its slabs through the uninstrumented methods, so slab growth is neither
+    # counted as a variable partition operation nor resets the search steps of the slab allocation
+    allocate_variable = instrumented("variable", "allocate")(_allocate_variable)
+    release_variable = instrumented("variable", "release")(_release_variable)
+
+
+REPLAY_MODES = ("fixed", "variable", "buddy", "slab", "bitmap")
+
+
+def read_memory_trace(file_path):
+    # Streams ("A", job, size) / ("F", job, None) events; lines are "A <job> <size>" or "F <job>"
+    with open(file_path, "r") as file:
+        for line_number, line in enumerate(file, 1):
+            fields = line.split()
+            if not fields or fields[0].startswith("#"):
+                continue
+            operation = fields[0].upper()
+            if operation == "A" and len(fields) == 3:
+                yield "A", fields[1], float(fields[2])
+            elif operation == "F" and len(fields) == 2:
+                yield "F", fields[1], None
+            else:
+                raise ValueError(f"第{line_number}行格式错误: {line.strip()}")
+
+
+def replay_trace(manager, events, mode, sample_interval=1000, max_samples=1000):
+    """Applies a stream of allocation/free events to one mode of the manager without the GUI.
+    The fragmentation timeline is sampled every sample_interval events; when it grows past
+    max_samples every other sample is dropped and the interval doubles, so memory stays bounded.
+    Sampling is timed separately (sampling_seconds) and left out of seconds and events_per_sec, since a
+    bitmap sample scans the whole bitmap."""
+    if mode not in REPLAY_MODES:
+        raise ValueError(f"未知分配方式: {mode}")
+    if sample_interval <= 0:
+        raise ValueError("采样间隔必须大于0")
+    allocate = getattr(manager, f"allocate_{mode}")
+    release = getattr(manager, f"release_{mode}")
+    quiet, manager.quiet = manager.quiet, True
+    counts = {"allocations": 0, "releases": 0, "alloc_failures": 0, "release_failures": 0}
+    timeline = []
+    started = time.perf_counter()
+    sampling = 0.0
+    event_count = 0
+    try:
+        for operation, job_name, size in events:
+            if operation == "A":
+                counts["allocations"] += 1
+                if not allocate(job_name, size):
+                    counts["alloc_failures"] += 1
             else:
-                merged.append((start, size))
-        self.variable_free = merged
+                counts["releases"] += 1
+                if not release(job_name):
+                    counts["release_failures"] += 1
+            event_count += 1
+            if event_count % sample_interval == 0:
+                sample_started = time.perf_counter()
+                free_total, largest = manager.free_space(mode)
+                fragmentation = 1 - largest / free_total if free_total else 0.0
+                timeline.append((event_count, free_total, largest, fragmentation))
+                if len(timeline) > max_samples:
+                    timeline = timeline[1::2]
+                    sample_interval *= 2
+                sampling += time.perf_counter() - sample_started
+    finally:
+        manager.quiet = quiet
+    seconds = time.perf_counter() - started - sampling
+    counts.update({"events": event_count, "seconds": seconds, "sampling_seconds": sampling,
+                   "events_per_sec": event_count / seconds if seconds else 0.0, "timeline": timeline,
+                   "compaction": dict(manager.compaction_stats)})
+    return counts
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        root = tk.Tk()
+        app = MemoryManagerGUI(root)
+        root.mainloop()
+        return
+
+    parser = argparse.ArgumentParser(description="内存分配轨迹回放")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    replay_parser = subparsers.add_parser("replay", help="不启动界面，回放分配/释放轨迹文件")
+    replay_parser.add_argument("trace", help="轨迹文件，每行为 \"A 作业 大小\" 或 \"F 作业\"")
+    replay_parser.add_argument("--mode", choices=REPLAY_MODES, default="variable", help="分配方式")
+    replay_parser.add_argument("--policy", choices=sorted(set(FIT_POLICIES.values())), default="first",
+                               help="可变分区的分配策略")
+    replay_parser.add_argument("--compaction", choices=[policy for policy in COMPACTION_POLICIES.values() if policy],
+                               help="分配失败时的紧凑策略")
+    replay_parser.add_argument("--compaction-threshold", type=float,
+                               help="释放后外部碎片率超过该值即紧凑（0~1）")
+    replay_parser.add_argument("--compaction-step", type=int, default=8, help="增量紧凑每次最多移动的作业数")
+    replay_parser.add_argument("--total-memory", type=float, default=128, help="内存总大小(K)")
+    replay_parser.add_argument("--unit-size", type=float, default=4, help="位图方式的分配单位(K)")
+    replay_parser.add_argument("--sample-interval", type=int, default=1000, help="碎片率采样间隔（事件数）")
+    replay_parser.add_argument("--timeline", help="把碎片率时间线写入该CSV文件")
+    replay_parser.add_argument("--metrics", help="把分配器统计写入该文件（.json 或 .csv）")
+    args = parser.parse_args(argv)
+    if args.sample_interval <= 0:
+        parser.error("--sample-interval 必须大于0")
+
+    try:
+        manager = MemoryManager(total_memory=args.total_memory, unit_size=args.unit_size,
+                                metrics=bool(args.metrics))
+        if args.mode == "buddy":
+            manager.buddy  # checks that the user memory is a whole number of K
+        elif args.mode == "bitmap":
+            manager.bitmap  # checks that the memory size is a multiple of the unit size
+    except ValueError as error:
+        parser.error(str(error))
+    manager.fit_policy = args.policy
+    manager.compaction = args.compaction
+    manager.compaction_threshold = args.compaction_threshold
+    manager.compaction_step = args.compaction_step
+    result = replay_trace(manager, read_memory_trace(args.trace), args.mode, args.sample_interval)
+    print(f"事件数：{result['events']}\t耗时：{result['seconds']:.3f}s\t吞吐量：{result['events_per_sec']:.0f} 事件/秒\t"
+          f"采样耗时：{result['sampling_seconds']:.3f}s")
+    print(f"分配：{result['allocations']}\t分配失败：{result['alloc_failures']}\t"
+          f"释放：{result['releases']}\t释放失败：{result['release_failures']}")
+    if args.compaction:
+        compaction = result["compaction"]
+        print(f"紧凑次数：{compaction['compactions']}\t移动作业：{compaction['moves']}\t"
+              f"移动量：{compaction['bytes_moved']:.2f}K\t紧凑耗时：{compaction['seconds']:.3f}s\t"
+              f"挽回分配：{compaction['rescued']}")
+    if args.timeline:
+        with open(args.timeline, "w") as file:
+            file.write("event,free_total,largest_free,external_fragmentation\n")
+            for row in result["timeline"]:
+                file.write("%d,%s,%s,%.6f\n" % row)
+    if args.metrics:
+        manager.write_metrics(args.metrics)
 
 
 if __name__ == "__main__":
-    root = tk.Tk()
-    app = MemoryManagerGUI(root)
-    root.mainloop()
+    main()
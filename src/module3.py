@@ -1,34 +1,172 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox
+import argparse
+import array
 import collections
+import csv
+import heapq
+import itertools
+import mmap
+import multiprocessing
+import operator
+import os
+import struct
+import sys
+import tempfile
+
+# 二进制页面序列文件：文件头为魔数、每个页面号的字节数和页面数，之后是小端 int32 页面号
+TRACE_MAGIC = b"PGTR"
+TRACE_HEADER = struct.Struct("<4sIQ")
+TRACE_ITEM_SIZE = 4
+
+
+def iter_pages(page_sequence):
+    """把页面号序列或页面号块（memoryview、array、list 等）的序列统一成逐个页面号的迭代器"""
+    pages = iter(page_sequence)
+    first = next(pages, None)
+    if first is None:
+        return iter(())
+    pages = itertools.chain((first,), pages)
+    if isinstance(first, int):
+        return pages
+    return itertools.chain.from_iterable(pages)
+
+
+# 淘汰记录的输出方式
+PREVIEW_LIMIT = 200  # 界面上最多显示的淘汰页面数
+EVICTION_MODES = {"完整列表": "list", "仅缺页次数": "count", "紧凑数组": "array", "写入文件": "file"}
+
+
+class EvictionCounter:
+    """只统计淘汰次数、不保存页面号的淘汰记录"""
+
+    __slots__ = ("count",)
+
+    def __init__(self):
+        self.count = 0
+
+    def append(self, page):
+        self.count += 1
+
+    def __len__(self):
+        return self.count
+
+
+class EvictionWriter:
+    """把淘汰的页面流式写入文件的淘汰记录，内存中只保留一个缓冲块和前 PREVIEW_LIMIT 个页面号（head）
+
+    .bin 文件使用二进制页面序列格式，可以直接作为页面序列再次读入；其余每行一个页面号。
+    """
+
+    def __init__(self, file_path, buffer_pages=1 << 16):
+        self.file_path = file_path
+        self.binary = file_path.endswith(".bin")
+        self.file = open(file_path, "wb" if self.binary else "w")
+        if self.binary:
+            self.file.write(TRACE_HEADER.pack(TRACE_MAGIC, TRACE_ITEM_SIZE, 0))  # 页面数在 close 时回填
+        self.buffer_pages = buffer_pages
+        self.buffer = array.array("i")
+        self.written = 0
+        self.head = []
+
+    def append(self, page):
+        self.buffer.append(page)
+        if len(self.buffer) >= self.buffer_pages:
+            self.flush()
+
+    def __len__(self):
+        return self.written + len(self.buffer)
+
+    def flush(self):
+        buffer = self.buffer
+        if len(self.head) < PREVIEW_LIMIT:
+            self.head.extend(buffer[:PREVIEW_LIMIT - len(self.head)])
+        if self.binary:
+            if sys.byteorder == "big":
+                buffer.byteswap()
+            buffer.tofile(self.file)
+        elif buffer:
+            self.file.write("\n".join(map(str, buffer)) + "\n")
+        self.written += len(buffer)
+        self.buffer = array.array("i")
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.flush()
+        if self.binary:
+            self.file.seek(0)
+            self.file.write(TRACE_HEADER.pack(TRACE_MAGIC, TRACE_ITEM_SIZE, self.written))
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def eviction_log(mode="list", file_path=None):
+    """按输出方式创建淘汰记录，各算法通过 evicted 参数接收它，只调用它的 append
+
+    "list"  —— 普通列表（默认）；"count" —— 只计数；"array" —— array('i')，每个页面号4字节；
+    "file"  —— 流式写入 file_path，用完需要 close。
+    """
+    if mode == "list":
+        return []
+    if mode == "count":
+        return EvictionCounter()
+    if mode == "array":
+        return array.array("i")
+    if mode == "file":
+        if not file_path:
+            raise ValueError("写入文件时必须指定文件路径")
+        return EvictionWriter(file_path)
+    raise ValueError(f"未知的淘汰记录方式: {mode}")
+
+
+def format_evictions(evicted, limit=PREVIEW_LIMIT):
+    """淘汰记录的预览文本，最多列出 limit 个页面号"""
+    if isinstance(evicted, EvictionCounter):
+        return f"（仅统计）共淘汰 {len(evicted)} 个页面"
+    pages = evicted.head if isinstance(evicted, EvictionWriter) else evicted[:limit]
+    text = str(list(pages[:limit]))
+    if len(evicted) > limit:
+        text += f" ……（共 {len(evicted)} 个，只显示前 {limit} 个）"
+    if isinstance(evicted, EvictionWriter):
+        text += f"\n淘汰记录已写入: {evicted.file_path}"
+    return text
 
 
 # FIFO页面调度算法
-def fifo(page_sequence, frame_size):
-    frames = []  # 用于存储页面的列表
+def fifo(page_sequence, frame_size, evicted=None):
+    page_sequence = iter_pages(page_sequence)  # 也接受页面号块的序列
+    frames = collections.deque()  # 按进入顺序排列的页面，队头是最先进入的页面
+    resident = set()  # 驻留页面集合，判断是否命中为 O(1)
     page_faults = 0  # 缺页次数
-    evicted_pages = []  # 淘汰的页面
+    evicted_pages = [] if evicted is None else evicted  # 淘汰的页面，见 eviction_log
 
     # 遍历页面序列
     for page in page_sequence:
         # 如果页面不在框架中，发生缺页
-        if page not in frames:
-            if len(frames) < frame_size:  # 如果框架还有空间
-                frames.append(page)  # 加载页面
-            else:
-                evicted_page = frames.pop(0)  # 淘汰最先进入的页面
+        if page not in resident:
+            if len(resident) >= frame_size:  # 框架已满
+                evicted_page = frames.popleft()  # 淘汰最先进入的页面
+                resident.discard(evicted_page)
                 evicted_pages.append(evicted_page)  # 记录被淘汰的页面
-                frames.append(page)  # 加载新页面
+            frames.append(page)  # 加载新页面
+            resident.add(page)
             page_faults += 1  # 增加缺页次数
 
     return evicted_pages, page_faults  # 返回淘汰的页面和缺页次数
 
 
 # LRU页面调度算法
-def lru(page_sequence, frame_size):
+def lru(page_sequence, frame_size, evicted=None):
+    page_sequence = iter_pages(page_sequence)  # 也接受页面号块的序列
     frames = collections.OrderedDict()  # 有序字典，用于模拟LRU（按访问顺序维护页面）
     page_faults = 0  # 缺页次数
-    evicted_pages = []  # 淘汰的页面
+    evicted_pages = [] if evicted is None else evicted  # 淘汰的页面，见 eviction_log
 
     # 遍历页面序列
     for page in page_sequence:
@@ -44,37 +182,737 @@ def lru(page_sequence, frame_size):
     return evicted_pages, page_faults  # 返回淘汰的页面和缺页次数
 
 
+# LFU 的频率桶
+class _Bucket:
+    __slots__ = ("frequency", "pages", "order", "prev", "next")
+
+    def __init__(self, frequency, pages):
+        self.frequency = frequency
+        self.pages = pages  # 该频率的页面 -> 装入序号，保持页面进入本桶的顺序
+        self.order = []  # 按装入序号排列的小根堆（惰性删除），只在按装入顺序破除平局时使用
+        self.prev = None
+        self.next = None
+
+
+class FrequencyBuckets:
+    """按频率升序串成双向链表的频率桶，每个桶保存该频率下的全部页面，链表头就是频率最低的桶。
+
+    tie_break 决定最低频率的页面之间淘汰谁：
+      "load"   —— 默认，最早装入的页面，与原实现的结果一致，桶内用堆维护装入顺序，命中和淘汰为 O(log n)；
+      "bucket" —— 最早达到该频率的页面，桶内直接按进入顺序排列，命中和淘汰都是 O(1)，但淘汰结果与原实现不同。
+    """
+
+    def __init__(self, tie_break="load"):
+        if tie_break not in ("load", "bucket"):
+            raise ValueError(f"未知的平局规则: {tie_break}")
+        self.by_load = tie_break == "load"
+        self.head = None  # 频率最低的桶
+        self.buckets = {}  # 频率 -> 桶
+        self.bucket_of = {}  # 页面 -> 所在的桶
+
+    def __len__(self):
+        return len(self.bucket_of)
+
+    def __contains__(self, page):
+        return page in self.bucket_of
+
+    def _bucket(self, frequency, after=None):
+        # 取频率为 frequency 的桶，没有就新建并从 after（None 表示链表头）往后找插入位置
+        bucket = self.buckets.get(frequency)
+        if bucket is not None:
+            return bucket
+        previous, following = (None, self.head) if after is None else (after, after.next)
+        while following is not None and following.frequency < frequency:
+            previous, following = following, following.next
+        # 按桶内顺序淘汰时要反复取第一个页面，普通字典从头部删除后取第一个元素要跳过已删除的槽位，
+        # 所以用 OrderedDict；按装入顺序淘汰时只按键查找，普通字典更快
+        bucket = self.buckets[frequency] = _Bucket(frequency, {} if self.by_load else collections.OrderedDict())
+        bucket.prev, bucket.next = previous, following
+        if previous is None:
+            self.head = bucket
+        else:
+            previous.next = bucket
+        if following is not None:
+            following.prev = bucket
+        return bucket
+
+    def _place(self, page, bucket, loaded):
+        self.bucket_of[page] = bucket
+        bucket.pages[page] = loaded
+        if self.by_load:
+            heapq.heappush(bucket.order, (loaded, page))
+
+    def _take(self, page):
+        # 把页面移出所在的桶，桶空了就从链表中摘除
+        bucket = self.bucket_of.pop(page)
+        loaded = bucket.pages.pop(page)
+        if not bucket.pages:
+            del self.buckets[bucket.frequency]
+            if bucket.prev is None:
+                self.head = bucket.next
+            else:
+                bucket.prev.next = bucket.next
+            if bucket.next is not None:
+                bucket.next.prev = bucket.prev
+        elif self.by_load and len(bucket.order) > 2 * len(bucket.pages) + 32:
+            # 过期的堆项太多时重建，堆的大小始终与桶内页面数同阶
+            bucket.order = [(seq, item) for item, seq in bucket.pages.items()]
+            heapq.heapify(bucket.order)
+        return loaded
+
+    def add(self, page, frequency, loaded):
+        """装入页面，loaded 是装入序号（必须递增）"""
+        self._place(page, self._bucket(frequency), loaded)
+
+    def touch(self, page):
+        """命中：页面频率加一，移到紧随其后的桶"""
+        bucket = self.bucket_of[page]
+        target = self._bucket(bucket.frequency + 1, bucket)
+        self._place(page, target, self._take(page))
+
+    def victim(self):
+        """频率最低的页面中按平局规则应被淘汰的页面"""
+        bucket = self.head
+        if not self.by_load:
+            return next(iter(bucket.pages))
+        order = bucket.order
+        while bucket.pages.get(order[0][1]) != order[0][0]:
+            heapq.heappop(order)  # 丢弃已离开本桶的页面留下的过期项
+        return order[0][1]
+
+    def evict(self):
+        """淘汰一个页面，返回 (页面, 访问频率)"""
+        page = self.victim()
+        frequency = self.bucket_of[page].frequency
+        self._take(page)
+        return page, frequency
+
+    def decay(self):
+        """老化：所有驻留页面的频率减半（至少为1），桶内原有的先后顺序保持不变"""
+        pages = []
+        bucket = self.head
+        while bucket is not None:
+            pages.extend((page, bucket.frequency, loaded) for page, loaded in bucket.pages.items())
+            bucket = bucket.next
+        self.head, self.buckets, self.bucket_of = None, {}, {}
+        bucket = None
+        for page, frequency, loaded in pages:  # 频率单调不减，新桶总是接在上一个桶之后
+            bucket = self._bucket(max(frequency >> 1, 1), bucket)
+            self._place(page, bucket, loaded)
+
+
 # LFU 页面调度算法
-def lfu(page_sequence, frame_size):
-    frames = {}  # 存储页面及其加载顺序
-    frequency = collections.defaultdict(int)  # 页面访问频率
+def lfu(page_sequence, frame_size, tie_break="load", keep_history=False, decay_interval=None, evicted=None):
+    """LFU：淘汰访问频率最低的页面，平局规则见 FrequencyBuckets
+
+    keep_history 为 True 时记住被淘汰页面的访问次数，页面再次装入时在此基础上继续累计；
+    decay_interval 为正整数时每隔这么多次访问把所有频率减半（老化 LFU），让过去的热点页面可以被淘汰。
+
+    默认的平局规则淘汰最早装入的页面，与原实现一致；"bucket" 规则淘汰最早达到该频率的页面：
+
+    >>> lfu([1, 2, 2, 1, 3], 2)
+    ([1], 3)
+    >>> lfu([1, 2, 3, 1, 2, 4, 4, 3, 5, 1], 3)
+    ([3, 1, 3, 5], 7)
+    >>> lfu([1, 2, 2, 1, 3], 2, tie_break="bucket")
+    ([2], 3)
+    """
+    page_sequence = iter_pages(page_sequence)  # 也接受页面号块的序列
+    frames = FrequencyBuckets(tie_break)  # 驻留页面及其访问频率
+    history = {}  # 被淘汰页面的访问次数
     page_faults = 0  # 缺页次数
-    evicted_pages = []  # 淘汰的页面
+    evicted_pages = [] if evicted is None else evicted  # 淘汰的页面，见 eviction_log
 
     # 遍历页面序列
-    for page in page_sequence:
-        if page not in frames:
+    for position, page in enumerate(page_sequence, 1):
+        if page in frames:
+            frames.touch(page)  # 命中，访问频率加一
+        else:
             # 如果框架已满，淘汰访问频率最低的页面
             if len(frames) >= frame_size:
-                least_frequent_page = min(frames, key=lambda x: (frequency[x], frames[x]))  # 找到频率最低的页面
-                evicted_pages.append(least_frequent_page)  # 记录淘汰的页面
-                frames.pop(least_frequent_page)  # 移除该页面
-                del frequency[least_frequent_page]  # 删除该页面的访问频率
+                evicted_page, frequency = frames.evict()
+                evicted_pages.append(evicted_page)  # 记录淘汰的页面
+                if keep_history:
+                    history[evicted_page] = frequency
+            frames.add(page, history.pop(page, 0) + 1, position)  # 装入页面，装入序号就是访问位置
+            page_faults += 1  # 增加缺页次数
+
+        if decay_interval and position % decay_interval == 0:
+            frames.decay()
+            history = {item: count >> 1 for item, count in history.items() if count > 1}
 
-            frames[page] = len(frames)  # 记录页面加载顺序
+    return evicted_pages, page_faults  # 返回淘汰的页面和缺页次数
+
+
+# OPT（Belady）页面调度算法
+def opt(page_sequence, frame_size, evicted=None):
+    """最优置换：淘汰下次访问最晚（或不再访问）的页面，是其他算法缺页次数的下界
+
+    先整体读入序列（已经是 memoryview 或 array 的页面序列直接使用，不复制），一次反向遍历求出每次访问之后
+    同一页面的下次访问位置；驻留页面按下次访问位置放在大根堆中（惰性删除），每次访问 O(log n)。
+    """
+    if not isinstance(page_sequence, (memoryview, array.array)):
+        page_sequence = array.array("q", iter_pages(page_sequence))
+    return _opt_run(page_sequence, _next_uses(page_sequence), frame_size, evicted)
+
+
+def _next_uses(pages):
+    """每次访问之后同一页面的下次访问位置，不再访问时为 len(pages)；位置不超过 int32 时每个只占4字节"""
+    never = len(pages)  # 不再访问的页面的“下次访问位置”
+    typecode = "i" if never < 1 << 31 else "q"
+    next_use = array.array(typecode, [0]) * never
+    following = {}  # 页面 -> 反向遍历时该页面最近出现的位置
+    for position in range(never - 1, -1, -1):
+        page = pages[position]
+        next_use[position] = following.get(page, never)
+        following[page] = position
+    return next_use
+
+
+def _opt_run(pages, next_use, frame_size, evicted=None):
+    """用预先求出的下次访问位置运行 OPT，同一序列的多个框架大小可以共用 next_use"""
+    frames = {}  # 驻留页面 -> 下次访问位置
+    farthest = []  # (-下次访问位置, 页面) 的堆，含过期项
+    page_faults = 0  # 缺页次数
+    evicted_pages = [] if evicted is None else evicted  # 淘汰的页面，见 eviction_log
+
+    for position, page in enumerate(pages):
+        if page not in frames:
+            if len(frames) >= frame_size:
+                while True:
+                    upcoming, evicted_page = heapq.heappop(farthest)
+                    if frames.get(evicted_page) == -upcoming:  # 跳过已过期的堆项
+                        break
+                del frames[evicted_page]
+                evicted_pages.append(evicted_page)  # 记录淘汰的页面
             page_faults += 1  # 增加缺页次数
+        elif len(farthest) > 2 * len(frames) + 32:
+            # 每次命中都会留下一个过期项，过多时按驻留页面重建堆
+            farthest = [(-upcoming, item) for item, upcoming in frames.items()]
+            heapq.heapify(farthest)
+        frames[page] = next_use[position]
+        heapq.heappush(farthest, (-next_use[position], page))
+
+    return evicted_pages, page_faults  # 返回淘汰的页面和缺页次数
+
+
+# CLOCK（二次机会）页面调度算法
+def clock(page_sequence, frame_size, evicted=None):
+    """框架排成环，指针扫过访问位为1的页面时清零并跳过，淘汰第一个访问位为0的页面，均摊 O(1)"""
+    page_sequence = iter_pages(page_sequence)  # 也接受页面号块的序列
+    slots = []  # 环形框架，下标为框架号
+    referenced = bytearray(frame_size)  # 各框架的访问位
+    slot_of = {}  # 页面 -> 框架号
+    hand = 0  # 时钟指针
+    page_faults = 0  # 缺页次数
+    evicted_pages = [] if evicted is None else evicted  # 淘汰的页面，见 eviction_log
+
+    for page in page_sequence:
+        slot = slot_of.get(page)
+        if slot is not None:
+            referenced[slot] = 1  # 命中，置访问位
+            continue
+        if len(slots) < frame_size:  # 还有空闲框架
+            slot = len(slots)
+            slots.append(page)
+        else:
+            while referenced[hand]:  # 给访问位为1的页面第二次机会
+                referenced[hand] = 0
+                hand = (hand + 1) % frame_size
+            slot = hand
+            evicted_page = slots[slot]
+            del slot_of[evicted_page]
+            evicted_pages.append(evicted_page)  # 记录淘汰的页面
+            slots[slot] = page
+            hand = (hand + 1) % frame_size
+        slot_of[page] = slot
+        referenced[slot] = 1
+        page_faults += 1  # 增加缺页次数
+
+    return evicted_pages, page_faults  # 返回淘汰的页面和缺页次数
 
-        # 更新页面的访问频率
-        frequency[page] += 1
+
+# ARC 页面调度算法
+def arc(page_sequence, frame_size, evicted=None):
+    """自适应置换缓存（Megiddo & Modha）：T1 保存只访问过一次的页面，T2 保存多次访问的页面，
+    B1、B2 记录两者最近淘汰的页面号（不占框架），根据在 B1、B2 中的命中动态调整 T1 的目标大小 p，每次访问 O(1)"""
+    page_sequence = iter_pages(page_sequence)  # 也接受页面号块的序列
+    recent = collections.OrderedDict()  # T1，队头最久未使用
+    frequent = collections.OrderedDict()  # T2
+    recent_ghosts = collections.OrderedDict()  # B1
+    frequent_ghosts = collections.OrderedDict()  # B2
+    target = 0  # T1 的目标大小 p
+    page_faults = 0  # 缺页次数
+    evicted_pages = [] if evicted is None else evicted  # 淘汰的页面，见 eviction_log
+
+    def replace(in_frequent_ghosts):
+        # 从 T1 或 T2 淘汰最久未使用的页面，页面号移入对应的幽灵表
+        if recent and (len(recent) > target or (in_frequent_ghosts and len(recent) == target)):
+            evicted_page, _ = recent.popitem(last=False)
+            recent_ghosts[evicted_page] = True
+        else:
+            evicted_page, _ = frequent.popitem(last=False)
+            frequent_ghosts[evicted_page] = True
+        evicted_pages.append(evicted_page)  # 记录淘汰的页面
+
+    for page in page_sequence:
+        if page in recent:  # 第二次访问，转入 T2
+            del recent[page]
+            frequent[page] = True
+            continue
+        if page in frequent:
+            frequent.move_to_end(page)
+            continue
+
+        page_faults += 1  # 增加缺页次数
+        if page in recent_ghosts:  # 最近从 T1 淘汰过：T1 应该更大
+            target = min(frame_size, target + max(len(frequent_ghosts) // len(recent_ghosts), 1))
+            replace(False)
+            del recent_ghosts[page]
+            frequent[page] = True
+        elif page in frequent_ghosts:  # 最近从 T2 淘汰过：T2 应该更大
+            target = max(0, target - max(len(recent_ghosts) // len(frequent_ghosts), 1))
+            replace(True)
+            del frequent_ghosts[page]
+            frequent[page] = True
+        else:
+            if len(recent) + len(recent_ghosts) == frame_size:
+                if len(recent) < frame_size:
+                    recent_ghosts.popitem(last=False)
+                    replace(False)
+                else:  # B1 为空，直接淘汰 T1 的最久未使用页面
+                    evicted_page, _ = recent.popitem(last=False)
+                    evicted_pages.append(evicted_page)  # 记录淘汰的页面
+            else:
+                total = len(recent) + len(frequent) + len(recent_ghosts) + len(frequent_ghosts)
+                if total >= frame_size:
+                    if total == 2 * frame_size:
+                        frequent_ghosts.popitem(last=False)
+                    replace(False)
+            recent[page] = True
 
     return evicted_pages, page_faults  # 返回淘汰的页面和缺页次数
 
 
+# 2Q 页面调度算法
+def two_queue(page_sequence, frame_size, evicted=None):
+    """2Q（Johnson & Shasha）：新页面先进入 FIFO 队列 A1in（占框架的1/4），被挤出的页面号记在 A1out（框架数的1/2，不占框架）；
+    在 A1out 中再次被访问的页面才进入 LRU 队列 Am，每次访问 O(1)"""
+    page_sequence = iter_pages(page_sequence)  # 也接受页面号块的序列
+    in_limit = max(frame_size // 4, 1)  # Kin
+    out_limit = max(frame_size // 2, 1)  # Kout
+    newcomers = collections.OrderedDict()  # A1in，队头最先进入
+    ghosts = collections.OrderedDict()  # A1out
+    hot = collections.OrderedDict()  # Am，队头最久未使用
+    page_faults = 0  # 缺页次数
+    evicted_pages = [] if evicted is None else evicted  # 淘汰的页面，见 eviction_log
+
+    for page in page_sequence:
+        if page in hot:
+            hot.move_to_end(page)
+            continue
+        if page in newcomers:  # A1in 中的命中不改变顺序
+            continue
+
+        page_faults += 1  # 增加缺页次数
+        if len(newcomers) + len(hot) >= frame_size:  # 框架已满
+            if len(newcomers) > in_limit or not hot:
+                evicted_page, _ = newcomers.popitem(last=False)
+                ghosts[evicted_page] = True
+                if len(ghosts) > out_limit:
+                    ghosts.popitem(last=False)
+            else:
+                evicted_page, _ = hot.popitem(last=False)
+            evicted_pages.append(evicted_page)  # 记录淘汰的页面
+        if page in ghosts:
+            del ghosts[page]
+            hot[page] = True
+        else:
+            newcomers[page] = True
+
+    return evicted_pages, page_faults  # 返回淘汰的页面和缺页次数
+
+
+# 单选按钮的取值 -> (算法名, 算法函数)
+ALGORITHMS = {
+    "1": ("FIFO", fifo),
+    "2": ("LRU", lru),
+    "3": ("LFU", lfu),
+    "4": ("OPT", opt),
+    "5": ("CLOCK", clock),
+    "6": ("ARC", arc),
+    "7": ("2Q", two_queue),
+}
+
+
+def compare_algorithms(file_path, frame_size, names=None):
+    """在同一页面序列上运行各算法，返回 [(算法名, 缺页次数, 缺页次数/OPT缺页次数)]，OPT 作为下界总是参与比较"""
+    functions = dict(ALGORITHMS.values())
+    names = ["OPT"] + [name for name in names or functions if name != "OPT"]
+    faults = {name: functions[name](read_page_sequence(file_path), frame_size, evicted=EvictionCounter())[1]
+              for name in names}
+    return [(name, faults[name], faults[name] / faults["OPT"] if faults["OPT"] else 1.0) for name in names]
+
+
+# 虚拟地址前端：TLB + 多级页表
+PAGE_TABLE_LEVEL_BITS = (9, 9, 9, 9)  # 与 x86-64 四级页表相同，4K 页面时覆盖 48 位虚拟地址
+
+
+class TLB:
+    """组相联 TLB：页号对组数取模选组，组内 LRU 替换"""
+
+    def __init__(self, entries=64, ways=4):
+        if entries <= 0 or ways <= 0 or entries % ways:
+            raise ValueError("TLB 表项数必须是相联度的正整数倍")
+        self.ways = ways
+        self.sets = [collections.OrderedDict() for _ in range(entries // ways)]  # 每组队头最久未使用
+
+    def lookup(self, page):
+        entries = self.sets[page % len(self.sets)]
+        if page in entries:
+            entries.move_to_end(page)
+            return True
+        return False
+
+    def insert(self, page):
+        entries = self.sets[page % len(self.sets)]
+        if len(entries) >= self.ways:
+            entries.popitem(last=False)
+        entries[page] = True
+
+    def invalidate(self, page):
+        self.sets[page % len(self.sets)].pop(page, None)
+
+
+class PageTable:
+    """多级页表：页号从高位到低位按 level_bits 分段，每段是一级页表的下标，最后一级记录页面是否在内存中；
+    下级页表在第一次访问时才创建"""
+
+    def __init__(self, level_bits=PAGE_TABLE_LEVEL_BITS):
+        if not level_bits or any(bits <= 0 for bits in level_bits):
+            raise ValueError("每级页表的位数必须大于0")
+        self.shifts = [sum(level_bits[index + 1:]) for index in range(len(level_bits))]  # 各级下标在页号中的位置
+        self.masks = [(1 << bits) - 1 for bits in level_bits]
+        self.page_limit = 1 << sum(level_bits)
+        self.root = {}
+        self.table_count = 1  # 已创建的页表数
+
+    def _leaf(self, page):
+        if not 0 <= page < self.page_limit:
+            raise ValueError(f"页号 {page} 超出页表范围")
+        table = self.root
+        for shift, mask in zip(self.shifts[:-1], self.masks):
+            index = (page >> shift) & mask
+            child = table.get(index)
+            if child is None:
+                child = table[index] = {}
+                self.table_count += 1
+            table = child
+        return table, page & self.masks[-1]
+
+    def walk(self, page):
+        """逐级查表，返回页面是否在内存中"""
+        table, index = self._leaf(page)
+        return table.get(index, False)
+
+    def set_present(self, page, present):
+        table, index = self._leaf(page)
+        table[index] = present
+
+
+def addresses_to_pages(address_chunks, page_size=4096):
+    """把虚拟地址块逐块转换为页号块（array('q')），每块的移位在 C 层的 map 中完成"""
+    if page_size <= 0 or page_size & (page_size - 1):
+        raise ValueError("页面大小必须是2的幂")
+    shift = page_size.bit_length() - 1
+    for chunk in address_chunks:
+        yield array.array("q", map(operator.rshift, chunk, itertools.repeat(shift)))
+
+
+def read_address_chunks(file_path, chunk_addresses=1 << 16):
+    """按块读取虚拟地址文件，每行一个地址，十进制或 0x 开头的十六进制"""
+    with open(file_path, "r") as file:
+        while True:
+            lines = list(itertools.islice(file, chunk_addresses))
+            if not lines:
+                break
+            yield [int(line, 0) for line in lines if line.strip()]
+
+
+class _Translation:
+    """把页面调度算法接到 TLB 和页表上：作为页面序列时每次产出一个页号并先做地址转换，
+    作为淘汰记录时使 TLB 表项失效并清除页表的在内存标志"""
+
+    def __init__(self, page_chunks, tlb, page_table):
+        self.page_chunks = page_chunks
+        self.tlb = tlb
+        self.page_table = page_table
+        self.references = 0
+        self.tlb_hits = 0
+        self.page_walks = 0
+        self.evictions = 0
+
+    def __iter__(self):
+        tlb, page_table = self.tlb, self.page_table
+        for chunk in self.page_chunks:
+            for page in chunk:
+                self.references += 1
+                if tlb.lookup(page):
+                    self.tlb_hits += 1
+                else:
+                    self.page_walks += 1
+                    if not page_table.walk(page):
+                        page_table.set_present(page, True)  # 缺页由调度算法统计并选择淘汰页面
+                    tlb.insert(page)
+                yield page
+
+    def append(self, page):
+        self.evictions += 1
+        self.tlb.invalidate(page)
+        self.page_table.set_present(page, False)
+
+
+def translate_addresses(address_chunks, frame_size, algorithm="LRU", page_size=4096, tlb_entries=64, tlb_ways=4,
+                        level_bits=PAGE_TABLE_LEVEL_BITS):
+    """模拟虚拟地址访问：地址先查 TLB，未命中时查多级页表，页面不在内存中时由所选算法在 frame_size 个框架中置换
+
+    算法必须是在线算法（OPT 需要预知整个序列，不能用）。返回统计结果字典。
+    """
+    functions = dict(ALGORITHMS.values())
+    if algorithm not in functions or algorithm == "OPT":
+        raise ValueError(f"不支持的页面调度算法: {algorithm}")
+    translation = _Translation(addresses_to_pages(address_chunks, page_size), TLB(tlb_entries, tlb_ways),
+                               PageTable(level_bits))
+    _, page_faults = functions[algorithm](iter(translation), frame_size, evicted=translation)
+    references = translation.references
+    return {
+        "references": references,
+        "tlb_hits": translation.tlb_hits,
+        "tlb_hit_rate": translation.tlb_hits / references if references else 0.0,
+        "page_walks": translation.page_walks,
+        "walk_memory_accesses": translation.page_walks * len(level_bits),
+        "page_faults": page_faults,
+        "page_fault_rate": page_faults / references if references else 0.0,
+        "page_tables": translation.page_table.table_count,
+    }
+
+
+# LRU 栈距离（Mattson 算法）
+def lru_stack_distances(page_sequence):
+    """一次遍历求出每次访问的 LRU 栈距离，返回 (distance_counts, cold_misses, references)
+
+    distance_counts[d] 是栈距离为 d 的访问次数（d 从1开始），栈距离 = 上次访问该页面以来访问过的不同页面数 + 1；
+    框架数为 f 时，栈距离大于 f 的访问和首次访问（cold_misses）都会缺页。
+    Fenwick 树按时间点记录每个页面的最近一次访问，每次访问 O(log n)。
+    """
+    capacity = 1 << 16  # Fenwick 树的时间点数
+    tree = [0] * (capacity + 1)
+    last_access = {}  # 页面 -> 最近一次访问的时间点
+    distance_counts = [0]
+    cold_misses = 0
+    references = 0
+    now = 0
+
+    for page in iter_pages(page_sequence):
+        references += 1
+        if now == capacity:
+            # 时间点用完：按先后把各页面的最近访问重新编号为 1..n，树的大小只与不同页面数有关
+            order = sorted(last_access, key=last_access.get)
+            capacity = max(capacity, 2 * len(order))
+            tree = [0] * (capacity + 1)
+            for moment, item in enumerate(order, 1):
+                last_access[item] = moment
+                tree[moment] = 1
+            for moment in range(1, capacity + 1):  # O(n) 建树
+                parent = moment + (moment & -moment)
+                if parent <= capacity:
+                    tree[parent] += tree[moment]
+            now = len(order)
+        now += 1
+
+        previous = last_access.get(page)
+        if previous is None:
+            cold_misses += 1
+        else:
+            moment, earlier = previous, 0
+            while moment:  # 前缀和：最近访问不晚于 previous 的页面数（含本页面）
+                earlier += tree[moment]
+                moment &= moment - 1
+            distance = len(last_access) - earlier + 1
+            if distance >= len(distance_counts):
+                distance_counts.extend([0] * (distance + 1 - len(distance_counts)))
+            distance_counts[distance] += 1
+            moment = previous
+            while moment <= capacity:
+                tree[moment] -= 1
+                moment += moment & -moment
+        last_access[page] = now
+        moment = now
+        while moment <= capacity:
+            tree[moment] += 1
+            moment += moment & -moment
+
+    return distance_counts, cold_misses, references
+
+
+# 缺页率曲线
+def miss_ratio_curve(page_sequence, max_frames=None):
+    """一次遍历得到 LRU 在框架数 1..max_frames 下的缺页次数，返回 [(框架数, 缺页次数, 缺页率)]
+
+    max_frames 缺省时取最大栈距离，更多的框架只会有首次访问的缺页。
+    """
+    distance_counts, cold_misses, references = lru_stack_distances(page_sequence)
+    if max_frames is None:
+        max_frames = max(len(distance_counts) - 1, 1)
+    page_faults = references  # 0 个框架时每次访问都缺页
+    curve = []
+    for frame_size in range(1, max_frames + 1):
+        if frame_size < len(distance_counts):
+            page_faults -= distance_counts[frame_size]
+        curve.append((frame_size, page_faults, page_faults / references if references else 0.0))
+    return curve
+
+
+def write_miss_ratio_curve(curve, file=sys.stdout):
+    writer = csv.writer(file)
+    writer.writerow(["frame_size", "page_faults", "miss_ratio"])
+    writer.writerows(curve)
+
+
+# 多进程参数扫描
+def _run_sweep_task(task):
+    """在工作进程中运行一个算法；各进程各自 mmap 同一个二进制文件，页面序列只在页缓存中存一份"""
+    file_path, name, frame_sizes = task
+    if name == "LRU":  # 栈距离算法一次遍历就得到所有框架大小下的缺页次数
+        curve = miss_ratio_curve(read_page_chunks(file_path), max(frame_sizes))
+        return [(name, frame_size, curve[frame_size - 1][1]) for frame_size in frame_sizes]
+    if name == "OPT":  # 整个序列直接使用 mmap 的内存，下次访问位置只求一次，所有框架大小共用
+        pages = read_page_view(file_path)
+        next_use = _next_uses(pages)
+        return [(name, frame_size, _opt_run(pages, next_use, frame_size, EvictionCounter())[1])
+                for frame_size in frame_sizes]
+    function = dict(ALGORITHMS.values())[name]
+    return [(name, frame_size, function(read_page_chunks(file_path), frame_size, evicted=EvictionCounter())[1])
+            for frame_size in frame_sizes]
+
+
+def sweep(file_path, algorithms, frame_sizes, processes=None):
+    """对 (算法, 框架大小) 的所有组合统计缺页次数，返回缺页次数矩阵 {算法名: {框架大小: 缺页次数}}
+
+    文本文件先转换成临时的二进制文件；各组合在进程池中并行运行，LRU 的所有框架大小合并为一次遍历，
+    OPT 的所有框架大小合并为一个任务，共用一份下次访问位置。
+    processes 为进程数，默认使用全部CPU核心，为 1 时在当前进程中依次运行。
+    """
+    functions = dict(ALGORITHMS.values())
+    for name in algorithms:
+        if name not in functions:
+            raise ValueError(f"未知页面调度算法: {name}")
+    if any(frame_size <= 0 for frame_size in frame_sizes):
+        raise ValueError("页面框架大小必须大于0")
+    if processes is not None and processes < 1:
+        raise ValueError("进程数必须大于0")
+    temporary = None
+    if not file_path.endswith(".bin"):
+        handle, temporary = tempfile.mkstemp(suffix=".bin")
+        os.close(handle)
+        convert_page_sequence(file_path, temporary)
+        file_path = temporary
+    tasks = []
+    for name in algorithms:
+        if name in ("LRU", "OPT"):
+            tasks.append((file_path, name, list(frame_sizes)))
+        else:
+            tasks.extend((file_path, name, [frame_size]) for frame_size in frame_sizes)
+    matrix = {name: {} for name in algorithms}
+    try:
+        if processes == 1 or len(tasks) <= 1:
+            results = list(map(_run_sweep_task, tasks))
+        else:
+            with multiprocessing.Pool(processes) as pool:
+                results = list(pool.imap_unordered(_run_sweep_task, tasks))
+    finally:
+        if temporary:
+            os.remove(temporary)
+    for rows in results:
+        for name, frame_size, page_faults in rows:
+            matrix[name][frame_size] = page_faults
+    return {name: {frame_size: row[frame_size] for frame_size in frame_sizes} for name, row in matrix.items()}
+
+
+def write_sweep_matrix(matrix, frame_sizes, file=sys.stdout):
+    """把缺页次数矩阵写成CSV：每行一个算法，每列一个框架大小"""
+    writer = csv.writer(file)
+    writer.writerow(["algorithm"] + list(frame_sizes))
+    for name, row in matrix.items():
+        writer.writerow([name] + [row[frame_size] for frame_size in frame_sizes])
+
+
 # 读取页面序列
 def read_page_sequence(file_path):
+    """返回逐个页面号的迭代器，整个文件不会一次性读入内存；.bin 为二进制页面序列文件，其余按每行一个页面号的文本处理"""
+    if file_path.endswith(".bin"):
+        return iter_pages(read_page_chunks(file_path))
+    return read_text_pages(file_path)
+
+
+def read_text_pages(file_path):
     with open(file_path, 'r') as file:
-        page_sequence = [int(line.strip()) for line in file.readlines()]  # 从文件中读取页面序列
-    return page_sequence
+        for line in file:
+            line = line.strip()
+            if line:  # 跳过空行
+                yield int(line)
+
+
+def read_page_chunks(file_path, chunk_pages=1 << 20):
+    """以 mmap 方式读取二进制页面序列文件，每次生成一个最多 chunk_pages 个页面号的 memoryview（不复制数据）
+
+    文件映射在最后一个块被释放后才会关闭，所以块可以在生成器结束后继续使用。
+    """
+    pages = read_page_view(file_path)
+    for start in range(0, len(pages), chunk_pages):
+        yield pages[start:start + chunk_pages]
+
+
+def read_page_view(file_path):
+    """以 mmap 方式打开二进制页面序列文件，返回整个页面序列的 int32 memoryview（大端机器上为转换后的 array）"""
+    with open(file_path, "rb") as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(mapped) < TRACE_HEADER.size:
+        raise ValueError("不是有效的二进制页面序列文件")
+    magic, item_size, count = TRACE_HEADER.unpack_from(mapped)
+    if magic != TRACE_MAGIC or item_size != TRACE_ITEM_SIZE:
+        raise ValueError("不是有效的二进制页面序列文件")
+    if len(mapped) < TRACE_HEADER.size + count * item_size:
+        raise ValueError("二进制页面序列文件不完整")
+    pages = memoryview(mapped)[TRACE_HEADER.size:TRACE_HEADER.size + count * item_size].cast("i")
+    if sys.byteorder == "big":  # 文件是小端序，大端机器上只能复制一份再转换
+        pages = array.array("i", pages)
+        pages.byteswap()
+    return pages
+
+
+def write_page_trace(file_path, page_sequence, chunk_pages=1 << 16):
+    """把页面号序列（或页面号块的序列）写成二进制页面序列文件，边读边写，返回页面数"""
+    count = 0
+    with open(file_path, "wb") as file:
+        file.write(TRACE_HEADER.pack(TRACE_MAGIC, TRACE_ITEM_SIZE, 0))  # 页面数写完后回填
+        pages = iter_pages(page_sequence)
+        while True:
+            chunk = array.array("i", itertools.islice(pages, chunk_pages))
+            if not chunk:
+                break
+            if sys.byteorder == "big":
+                chunk.byteswap()
+            chunk.tofile(file)
+            count += len(chunk)
+        file.seek(0)
+        file.write(TRACE_HEADER.pack(TRACE_MAGIC, TRACE_ITEM_SIZE, count))
+    return count
+
+
+def convert_page_sequence(text_path, binary_path):
+    """把文本页面序列文件转换为二进制格式，返回页面数"""
+    return write_page_trace(binary_path, read_page_sequence(text_path))
 
 
 # GUI 主窗口 (GUI Main window)
@@ -82,7 +920,7 @@ class PageSchedulingApp:
     def __init__(self, root):
         self.root = root
         self.root.title("页面调度算法")  # 设置窗口标题
-        self.root.geometry("700x550")  # 设置窗口大小
+        self.root.geometry("700x700")  # 设置窗口大小
 
         # 标签和输入框 (Labels and Input fields)
         self.algorithm_label = tk.Label(root, text="选择页面调度算法")  # 标签：选择页面调度算法
@@ -101,6 +939,11 @@ class PageSchedulingApp:
         self.lfu_rb = tk.Radiobutton(root, text="LFU", variable=self.algorithm_var, value="3", command=self.clear_text)
         self.lfu_rb.pack()  # LFU按钮
 
+        # OPT、CLOCK、ARC、2Q的单选按钮
+        for value in ("4", "5", "6", "7"):
+            tk.Radiobutton(root, text=ALGORITHMS[value][0], variable=self.algorithm_var, value=value,
+                           command=self.clear_text).pack()
+
         # 页面框架大小输入框 (Input field for frame size)
         self.frame_size_label = tk.Label(root, text="页面框架大小:")  # 标签：页面框架大小
         self.frame_size_label.pack(pady=5)
@@ -118,6 +961,15 @@ class PageSchedulingApp:
         self.browse_button = tk.Button(root, text="浏览", command=self.load_file)  # 按钮：浏览按钮
         self.browse_button.pack(pady=5)
 
+        # 淘汰记录的输出方式 (Eviction output mode)
+        self.output_frame = tk.Frame(root)
+        self.output_frame.pack(pady=5)
+        tk.Label(self.output_frame, text="淘汰记录:").pack(side=tk.LEFT)
+        self.output_var = tk.StringVar()
+        self.output_var.set("完整列表")
+        for label in EVICTION_MODES:
+            tk.Radiobutton(self.output_frame, text=label, variable=self.output_var, value=label).pack(side=tk.LEFT)
+
         # 结果显示框 (Text area to display results)
         self.result_text = tk.Text(root, width=50, height=10)
         self.result_text.pack()
@@ -126,11 +978,15 @@ class PageSchedulingApp:
         self.run_button = tk.Button(root, text="运行", command=self.run_algorithm)  # 按钮：运行按钮
         self.run_button.pack(pady=10)
 
+        # 缺页率曲线按钮：一次遍历得到 LRU 在各个框架大小下的缺页次数
+        self.curve_button = tk.Button(root, text="LRU缺页率曲线", command=self.show_miss_ratio_curve)
+        self.curve_button.pack(pady=5)
+
         self.file_path = None  # 文件路径初始值为空
 
     # 选择文件 (Load file function)
     def load_file(self):
-        self.file_path = filedialog.askopenfilename(title="选择页面序列文件", filetypes=[("Text Files", "*.txt")])  # 打开文件选择对话框
+        self.file_path = filedialog.askopenfilename(title="选择页面序列文件", filetypes=[("Text Files", "*.txt"), ("Binary Trace", "*.bin")])  # 打开文件选择对话框
         self.file_path_entry.delete(0, tk.END)  # 清空原来的文件路径
         self.file_path_entry.insert(0, self.file_path)  # 显示选择的文件路径
 
@@ -153,18 +1009,25 @@ class PageSchedulingApp:
 
             # 根据选择的算法运行相应的页面调度算法
             algorithm_choice = self.algorithm_var.get()
-            if algorithm_choice == '1':
-                evicted_pages, page_faults = fifo(page_sequence, frame_size)  # FIFO算法
-            elif algorithm_choice == '2':
-                evicted_pages, page_faults = lru(page_sequence, frame_size)  # LRU算法
-            elif algorithm_choice == '3':
-                evicted_pages, page_faults = lfu(page_sequence, frame_size)  # LFU算法
-            else:
+            if algorithm_choice not in ALGORITHMS:
                 messagebox.showerror("错误", "无效的选择")  # 弹出错误提示，选择无效
                 return
+            mode = EVICTION_MODES[self.output_var.get()]
+            log_path = None
+            if mode == "file":
+                log_path = filedialog.asksaveasfilename(title="保存淘汰记录", defaultextension=".txt",
+                                                        filetypes=[("Text Files", "*.txt"), ("Binary Trace", "*.bin")])
+                if not log_path:
+                    return
+            evicted = eviction_log(mode, log_path)
+            try:
+                evicted_pages, page_faults = ALGORITHMS[algorithm_choice][1](page_sequence, frame_size, evicted=evicted)
+            finally:
+                if mode == "file":
+                    evicted.close()
 
             # 显示结果 (Display results)
-            result = f"每次淘汰的页面号: {evicted_pages}\n缺页总次数: {page_faults}"
+            result = f"每次淘汰的页面号: {format_evictions(evicted_pages)}\n缺页总次数: {page_faults}"
             self.result_text.delete(1.0, tk.END)  # 清空文本框
             self.result_text.insert(tk.END, result)  # 插入结果文本
 
@@ -175,11 +1038,108 @@ class PageSchedulingApp:
             messagebox.showerror("错误", f"发生错误: {str(e)}")  # 弹出错误提示，发生异常
 
 
+    # 显示缺页率曲线 (Show the LRU miss-ratio curve)
+    def show_miss_ratio_curve(self):
+        if not self.file_path:
+            messagebox.showerror("错误", "请先选择页面序列文件")
+            return
+
+        try:
+            page_sequence = read_page_sequence(self.file_path)
+            max_frames = int(self.frame_size_entry.get()) if self.frame_size_entry.get().strip() else None
+            curve = miss_ratio_curve(page_sequence, max_frames)
+            step = max(-(-len(curve) // PREVIEW_LIMIT), 1)  # 行数太多时等间隔抽样显示，最后一行总是显示
+            shown = curve[step - 1::step]
+            if shown[-1:] != curve[-1:]:
+                shown.append(curve[-1])
+            lines = ["框架大小\t缺页次数\t缺页率"]
+            lines.extend(f"{frame_size}\t{page_faults}\t{ratio:.4f}" for frame_size, page_faults, ratio in shown)
+            self.result_text.delete(1.0, tk.END)
+            self.result_text.insert(tk.END, "\n".join(lines))
+        except Exception as e:
+            messagebox.showerror("错误", f"发生错误: {str(e)}")
+
+
 # 创建并运行GUI应用 (Create and run the GUI application)
-def main():
-    root = tk.Tk()  # 创建主窗口
-    app = PageSchedulingApp(root)  # 初始化应用
-    root.mainloop()  # 进入主循环
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        root = tk.Tk()  # 创建主窗口
+        app = PageSchedulingApp(root)  # 初始化应用
+        root.mainloop()  # 进入主循环
+        return
+
+    parser = argparse.ArgumentParser(description="页面调度算法")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    curve_parser = subparsers.add_parser("mrc", help="一次遍历输出 LRU 在各个框架大小下的缺页率曲线（CSV）")
+    curve_parser.add_argument("trace", help="页面序列文件，每行一个页面号")
+    curve_parser.add_argument("--max-frames", type=int, help="最大框架数，缺省为最大栈距离")
+    curve_parser.add_argument("--output", help="输出CSV文件，缺省输出到标准输出")
+    compare_parser = subparsers.add_parser("compare", help="比较各算法的缺页次数，以 OPT 为下界")
+    compare_parser.add_argument("trace", help="页面序列文件（文本或 .bin）")
+    compare_parser.add_argument("frame_size", type=int, help="页面框架大小")
+    compare_parser.add_argument("--algorithms", nargs="+", choices=[name for name, _ in ALGORITHMS.values()],
+                                help="参与比较的算法，缺省为全部")
+    sweep_parser = subparsers.add_parser("sweep", help="多进程统计各算法在各框架大小下的缺页次数矩阵")
+    sweep_parser.add_argument("trace", help="页面序列文件（文本或 .bin）")
+    sweep_parser.add_argument("--algorithms", nargs="+", choices=[name for name, _ in ALGORITHMS.values()],
+                              default=["FIFO", "LRU", "LFU"], help="页面调度算法")
+    sweep_parser.add_argument("--frame-sizes", nargs="+", type=int, required=True, help="页面框架大小")
+    sweep_parser.add_argument("--jobs", type=int, default=None, help="并行进程数，默认为CPU核心数")
+    sweep_parser.add_argument("--output", help="结果CSV文件，默认输出到标准输出")
+    translate_parser = subparsers.add_parser("translate", help="模拟虚拟地址序列经过 TLB 和多级页表的访问")
+    translate_parser.add_argument("trace", help="虚拟地址文件，每行一个地址（十进制或 0x 开头的十六进制）")
+    translate_parser.add_argument("frame_size", type=int, help="页面框架数")
+    translate_parser.add_argument("--algorithm", default="LRU",
+                                  choices=[name for name, _ in ALGORITHMS.values() if name != "OPT"], help="页面调度算法")
+    translate_parser.add_argument("--page-size", type=int, default=4096, help="页面大小（字节，2的幂）")
+    translate_parser.add_argument("--tlb-entries", type=int, default=64, help="TLB 表项数")
+    translate_parser.add_argument("--tlb-ways", type=int, default=4, help="TLB 相联度")
+    translate_parser.add_argument("--levels", nargs="+", type=int, default=list(PAGE_TABLE_LEVEL_BITS),
+                                  help="从高到低各级页表的下标位数")
+    convert_parser = subparsers.add_parser("convert", help="把文本页面序列文件转换为二进制格式")
+    convert_parser.add_argument("source", help="文本页面序列文件，每行一个页面号")
+    convert_parser.add_argument("target", help="输出的二进制页面序列文件（.bin）")
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        print("算法\t缺页次数\t相对OPT")
+        for name, page_faults, ratio in compare_algorithms(args.trace, args.frame_size, args.algorithms):
+            print(f"{name}\t{page_faults}\t{ratio:.3f}")
+        return
+
+    if args.command == "sweep":
+        if args.jobs is not None and args.jobs < 1:
+            sweep_parser.error("--jobs 必须大于0")
+        matrix = sweep(args.trace, args.algorithms, args.frame_sizes, args.jobs)
+        if args.output:
+            with open(args.output, "w", newline="") as file:
+                write_sweep_matrix(matrix, args.frame_sizes, file)
+        else:
+            write_sweep_matrix(matrix, args.frame_sizes)
+        return
+
+    if args.command == "translate":
+        stats = translate_addresses(read_address_chunks(args.trace), args.frame_size, args.algorithm, args.page_size,
+                                    args.tlb_entries, args.tlb_ways, args.levels)
+        print(f"访问次数: {stats['references']}")
+        print(f"TLB命中率: {stats['tlb_hit_rate']:.4f}（命中 {stats['tlb_hits']} 次）")
+        print(f"页表查询次数: {stats['page_walks']}（访存 {stats['walk_memory_accesses']} 次）")
+        print(f"缺页次数: {stats['page_faults']}（缺页率 {stats['page_fault_rate']:.4f}）")
+        print(f"页表数: {stats['page_tables']}")
+        return
+
+    if args.command == "convert":
+        count = convert_page_sequence(args.source, args.target)
+        print(f"已写入 {count} 个页面号")
+        return
+
+    curve = miss_ratio_curve(read_page_sequence(args.trace), args.max_frames)
+    if args.output:
+        with open(args.output, "w", newline="") as file:
+            write_miss_ratio_curve(curve, file)
+    else:
+        write_miss_ratio_curve(curve)
 
 
 if __name__ == "__main__":
@@ -1,3 +1,5 @@
+import bisect
+import collections
 import tkinter as tk
 from tkinter import filedialog, messagebox
 
@@ -30,15 +32,34 @@ def fcfs(service_sequence, current_position):
 def sstf(service_sequence, current_position):
     total_head_movement = 0  # 初始化总磁头移动距离
     service_order = []  # 存储服务顺序
-    remaining_tracks = service_sequence.copy()  # 创建磁道请求序列的副本
-
-    # 循环处理每个磁道请求，选择距离当前磁头位置最近的磁道
-    while remaining_tracks:
-        closest_track = min(remaining_tracks, key=lambda x: abs(x - current_position))  # 找到最近的磁道
+    counts = collections.Counter(service_sequence)  # 每个磁道的请求数
+    first_request = {}  # 每个磁道第一次出现的位置，两侧距离相同时先服务出现得早的磁道
+    for index, track in enumerate(service_sequence):
+        first_request.setdefault(track, index)
+    tracks = sorted(counts)  # 去重后排序的磁道
+
+    # 已服务的磁道总是排序数组中包含磁头位置的一段连续区间，最近的磁道只可能是区间两侧的第一个磁道
+    right = bisect.bisect_left(tracks, current_position)  # 磁头右侧（含当前位置）最近的未服务磁道
+    left = right - 1  # 磁头左侧最近的未服务磁道
+    while left >= 0 or right < len(tracks):
+        if right == len(tracks):
+            take_left = True
+        elif left < 0:
+            take_left = False
+        else:
+            left_distance = current_position - tracks[left]
+            right_distance = tracks[right] - current_position
+            take_left = (left_distance < right_distance or
+                         left_distance == right_distance and first_request[tracks[left]] < first_request[tracks[right]])
+        if take_left:
+            closest_track = tracks[left]
+            left -= 1
+        else:
+            closest_track = tracks[right]
+            right += 1
         total_head_movement += abs(closest_track - current_position)  # 更新总移动道数
         current_position = closest_track  # 更新磁头位置
-        service_order.append(closest_track)  # 将该磁道添加到服务顺序
-        remaining_tracks.remove(closest_track)  # 从剩余请求中移除已处理的磁道
+        service_order.extend([closest_track] * counts[closest_track])  # 同一磁道的请求距离为0，连续服务
 
     return service_order, total_head_movement  # 返回服务顺序和总移动道数
 